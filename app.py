@@ -1,9 +1,26 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
 import numpy as np
-import openai
+import concurrent.futures
+import functools
+import html
+import logging
+import os
 import time
 
+from lucidus import llm, llm_async, metrics, render, scoring, tracing, warm
+from lucidus.cache import LRUCache, PersistentCache
+from lucidus.catalog_source import Catalog, CatalogSource
+from lucidus.match_memo import MatchMemo
+from lucidus.prefetch import Prefetcher, SessionPrefetch
+from lucidus.records import Profile
+from lucidus.resilience import AsyncResilientClient, CircuitBreaker, RateLimiter, ResilientClient
+from lucidus.session_memory import SessionMemory, estimate_bytes
+from lucidus.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
 # Set page configuration
 st.set_page_config(
     page_title="Career Discovery Algorithm",
@@ -12,486 +29,187 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Add custom CSS for styling - with direct CSS for tag elements
-st.markdown("""
-<style>
-    .main {
-        padding: 1rem;
-    }
-    .step-header {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        margin-bottom: 1rem;
-    }
-    
-    /* Define styles directly for spans instead of using classes */
-    span.tag {
-        background-color: #f1f1f1;
-        border-radius: 1rem;
-        padding: 0.2rem 0.6rem;
-        margin-right: 0.3rem;
-        margin-bottom: 0.3rem;
-        display: inline-block;
-        font-size: 0.8rem;
-    }
-    
-    span.interest-tag {
-        background-color: #e1f5fe;
-        color: #0277bd;
-        border-radius: 1rem;
-        padding: 0.2rem 0.6rem;
-        margin-right: 0.3rem;
-        margin-bottom: 0.3rem;
-        display: inline-block;
-        font-size: 0.8rem;
-    }
-    
-    span.skill-tag {
-        background-color: #e8f5e9;
-        color: #2e7d32;
-        border-radius: 1rem;
-        padding: 0.2rem 0.6rem;
-        margin-right: 0.3rem;
-        margin-bottom: 0.3rem;
-        display: inline-block;
-        font-size: 0.8rem;
-    }
-    
-    span.sdg-tag {
-        background-color: #ede7f6;
-        color: #5e35b1;
-        border-radius: 1rem;
-        padding: 0.2rem 0.6rem;
-        margin-right: 0.3rem;
-        margin-bottom: 0.3rem;
-        display: inline-block;
-        font-size: 0.8rem;
-    }
-    
-    .step-container {
-        background-color: white;
-        padding: 1.5rem;
-        border-radius: 0.5rem;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        margin-bottom: 1.5rem;
-    }
-    
-    .progress-step {
-        width: 50px;
-        height: 50px;
-        border-radius: 50%;
-        display: flex;
-        align-items: center;
-        justify-content: center;
-        font-weight: bold;
-    }
-    
-    .progress-active {
-        background-color: #1976d2;
-        color: white;
-    }
-    
-    .progress-complete {
-        background-color: #4caf50;
-        color: white;
-    }
-    
-    .progress-inactive {
-        background-color: #e0e0e0;
-        color: #757575;
-    }
-    
-    .career-card {
-        cursor: pointer;
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-    
-    .career-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 10px 20px rgba(0,0,0,0.15);
-    }
-    
-    .career-detail-container {
-        border: 1px solid #e0e0e0;
-        border-radius: 0.5rem;
-        padding: 1.5rem;
-        margin-top: 1.5rem;
-        background-color: #fafafa;
-    }
-    
-    .ai-analysis {
-        background-color: #f5f9ff;
-        border-left: 4px solid #1976d2;
-        padding: 1rem;
-        margin: 1rem 0;
-        border-radius: 0 0.5rem 0.5rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Opt-in rerun tracing: LUCIDUS_TRACE names a Chrome trace (.json) or JSONL (.jsonl) file, and
+# LUCIDUS_PROFILE_TOP=N keeps cProfile stats of the N slowest reruns in LUCIDUS_PROFILE_DIR
+@st.cache_resource
+def get_tracer():
+    path = os.environ.get("LUCIDUS_TRACE")
+    if not path:
+        return None
+    return tracing.Tracer(
+        path,
+        profile_top=int(os.environ.get("LUCIDUS_PROFILE_TOP", "0")),
+        profile_dir=os.environ.get("LUCIDUS_PROFILE_DIR", "profiles")
+    )
+
+tracer = get_tracer()
+if tracer is not None:
+    # A rerun cut short by st.rerun() never reaches the end of the script, so its trace ends here
+    if "_trace" in st.session_state:
+        tracer.finish(st.session_state.pop("_trace"), interrupted=True)
+    st.session_state._trace = tracer.start(step=st.session_state.get("step", 1))
+tracing.section("styles")
+
+# Shared styles live in a static asset, read once per process
+@st.cache_resource
+def load_styles():
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets", "style.css"), encoding="utf-8") as f:
+        return f"<style>\n{f.read()}</style>"
+
+st.markdown(load_styles(), unsafe_allow_html=True)
+
+tracing.section("setup")
+
+# Stream LLM output token by token; set LUCIDUS_STREAM=0 to wait for full responses
+STREAM_LLM = os.environ.get("LUCIDUS_STREAM", "1") != "0"
+
+# Maximum concurrent OpenAI requests when explaining all displayed matches
+LLM_CONCURRENCY = int(os.environ.get("LUCIDUS_LLM_CONCURRENCY", "6"))
+
+# Maximum career detail prefetches a single session may start
+PREFETCH_CAP = int(os.environ.get("LUCIDUS_PREFETCH_CAP", "12"))
+
+# Each session keeps at most this many AI texts (and bytes) of its own; older ones are reread
+# from the shared caches
+SESSION_CACHE_ENTRIES = int(os.environ.get("LUCIDUS_SESSION_CACHE_ENTRIES", "24"))
+SESSION_CACHE_BYTES = int(os.environ.get("LUCIDUS_SESSION_CACHE_BYTES", str(256 * 1024)))
+
+# Ranked matches of this many recent profiles (and bytes) are shared by all sessions
+MATCH_MEMO_ENTRIES = int(os.environ.get("LUCIDUS_MATCH_MEMO_ENTRIES", "4096"))
+MATCH_MEMO_BYTES = int(os.environ.get("LUCIDUS_MATCH_MEMO_BYTES", str(8 * 1024 * 1024)))
+
+# Per-attempt OpenAI timeout in seconds; retries and backoff come from ResilientClient
+LLM_TIMEOUT = float(os.environ.get("LUCIDUS_LLM_TIMEOUT", "30"))
+
+# Seconds a page waits for AI text before showing a local summary instead; 0 waits indefinitely.
+# Late responses still finish in the background and replace the summary on the next view.
+LLM_DEADLINE = float(os.environ.get("LUCIDUS_LLM_DEADLINE", "10")) or None
+
+# Rate limiter and circuit breaker shared by every OpenAI call in this process
+@st.cache_resource
+def get_llm_guards():
+    limiter = RateLimiter(
+        requests_per_minute=int(os.environ.get("LUCIDUS_OPENAI_RPM", "500")),
+        tokens_per_minute=int(os.environ.get("LUCIDUS_OPENAI_TPM", "200000"))
+    )
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    return limiter, breaker
 
 # Initialize OpenAI client
 @st.cache_resource
 def get_openai_client():
     # Get API key from Streamlit Secrets
     api_key = st.secrets["openai"]["api_key"]
-    return openai.OpenAI(api_key=api_key)
-
-# Career data with mappings to interests, skills, and SDGs
-@st.cache_data
-def load_career_data():
-    careers = [
-        {
-            "id": 1,
-            "title": "Microfinance Specialist",
-            "description": "Designs small loans and savings programs to support underserved communities.",
-            "interests": ["Economics", "Business Studies / Entrepreneurship", "Global Politics / Civics"],
-            "skills": ["Strategic thinking", "Data analysis", "Helping people", "Understanding cultures"],
-            "sdgs": [1, 8, 10]  # No Poverty, Decent Work & Economic Growth, Reduced Inequalities
-        },
-        {
-            "id": 2,
-            "title": "Agroecologist",
-            "description": "Applies ecological science to farming for healthier food systems and better soil.",
-            "interests": ["Biology", "Environmental Systems & Societies / Environmental Science", "Agriculture / Sustainable Farming"],
-            "skills": ["Working outdoors", "Problem solving", "Supporting the planet", "Working with animals"],
-            "sdgs": [2, 13, 15]  # Zero Hunger, Climate Action, Life on Land
-        },
-        {
-            "id": 3,
-            "title": "Biomedical Engineer",
-            "description": "Develops medical devices like prosthetics, diagnostic tools, and wearable tech.",
-            "interests": ["Biology", "Physics", "Engineering (General or Applied)", "Design & Technology / Engineering"],
-            "skills": ["Problem solving", "Building or fixing", "Using tools/machines", "Helping people"],
-            "sdgs": [3, 9, 10]  # Good Health & Well-Being, Industry/Innovation/Infrastructure, Reduced Inequalities
-        },
-        {
-            "id": 4,
-            "title": "Digital Learning Developer",
-            "description": "Creates educational games, apps, and platforms for digital learning.",
-            "interests": ["Computer Science / Programming", "Education", "Design & Technology / Engineering"],
-            "skills": ["Coding", "Designing digitally", "Writing or storytelling", "Explaining ideas"],
-            "sdgs": [4, 9, 10]  # Quality Education, Industry/Innovation/Infrastructure, Reduced Inequalities
-        },
-        {
-            "id": 5,
-            "title": "Hydrologist",
-            "description": "Studies the water cycle and helps improve clean water access and conservation.",
-            "interests": ["Environmental Systems & Societies / Environmental Science", "Geography", "Chemistry"],
-            "skills": ["Data analysis", "Working outdoors", "Supporting the planet", "Problem solving"],
-            "sdgs": [6, 13, 14]  # Clean Water & Sanitation, Climate Action, Life Below Water
-        },
-        {
-            "id": 6,
-            "title": "Wind Turbine Technician",
-            "description": "Installs and maintains turbines that convert wind into clean electricity.",
-            "interests": ["Physics", "Engineering (General or Applied)", "Environmental Systems & Societies / Environmental Science"],
-            "skills": ["Building or fixing", "Working outdoors", "Using tools/machines", "Supporting the planet"],
-            "sdgs": [7, 8, 13]  # Affordable & Clean Energy, Decent Work & Economic Growth, Climate Action
-        },
-        {
-            "id": 7,
-            "title": "Waste Management Engineer",
-            "description": "Designs systems for composting, recycling, and waste reduction.",
-            "interests": ["Environmental Systems & Societies / Environmental Science", "Chemistry", "Engineering (General or Applied)"],
-            "skills": ["Problem solving", "Strategic thinking", "Supporting the planet", "Building or fixing"],
-            "sdgs": [11, 12, 13]  # Sustainable Cities, Responsible Consumption & Production, Climate Action
-        },
-        {
-            "id": 8,
-            "title": "Circular Economy Analyst",
-            "description": "Redesigns how companies produce and reuse materials to reduce waste.",
-            "interests": ["Business Studies / Entrepreneurship", "Environmental Systems & Societies / Environmental Science", "Economics"],
-            "skills": ["Strategic thinking", "Data analysis", "Supporting the planet", "Standing up for causes"],
-            "sdgs": [9, 12, 13]  # Industry/Innovation, Responsible Consumption & Production, Climate Action
-        },
-        {
-            "id": 9,
-            "title": "Sustainable Fashion Designer",
-            "description": "Creates trendy clothing using ethical and eco-friendly materials.",
-            "interests": ["Visual Arts (drawing, painting, sculpture)", "Graphic Design / Digital Media", "Product Design / Industrial Design"],
-            "skills": ["Creative thinking", "Drawing or painting", "Supporting the planet", "Designing digitally"],
-            "sdgs": [12, 13, 8]  # Responsible Consumption, Climate Action, Decent Work & Economic Growth
-        },
-        {
-            "id": 10,
-            "title": "Atmospheric Scientist",
-            "description": "Studies weather and climate systems to understand and model change.",
-            "interests": ["Physics", "Geography", "Environmental Systems & Societies / Environmental Science"],
-            "skills": ["Data analysis", "Strategic thinking", "Supporting the planet", "Problem solving"],
-            "sdgs": [13, 11, 17]  # Climate Action, Sustainable Cities, Partnerships for Goals
-        },
-        {
-            "id": 11,
-            "title": "Carbon Accounting Analyst",
-            "description": "Tracks emissions and helps companies reduce their carbon footprint.",
-            "interests": ["Economics", "Environmental Systems & Societies / Environmental Science", "Business Studies / Entrepreneurship"],
-            "skills": ["Data analysis", "Strategic thinking", "Supporting the planet", "Decision-making"],
-            "sdgs": [12, 13, 9]  # Responsible Consumption, Climate Action, Industry/Innovation
-        },
-        {
-            "id": 12,
-            "title": "Marine Biologist",
-            "description": "Studies ocean ecosystems and works to protect marine biodiversity.",
-            "interests": ["Biology", "Environmental Systems & Societies / Environmental Science", "Geography"],
-            "skills": ["Working outdoors", "Data analysis", "Supporting the planet", "Working with animals"],
-            "sdgs": [14, 13, 15]  # Life Below Water, Climate Action, Life on Land
-        },
-        {
-            "id": 13,
-            "title": "Urban City Planner",
-            "description": "Designs greener, more connected cities using sustainable planning.",
-            "interests": ["Geography", "Architecture / Interior Design", "Environmental Systems & Societies / Environmental Science"],
-            "skills": ["Strategic thinking", "Designing digitally", "Problem solving", "Supporting the planet"],
-            "sdgs": [11, 9, 13]  # Sustainable Cities, Industry/Innovation, Climate Action
-        },
-        {
-            "id": 14,
-            "title": "Resilience Engineer",
-            "description": "Builds infrastructure that can withstand floods, heatwaves, and climate shocks.",
-            "interests": ["Engineering (General or Applied)", "Physics", "Environmental Systems & Societies / Environmental Science"],
-            "skills": ["Problem solving", "Strategic thinking", "Building or fixing", "Decision-making"],
-            "sdgs": [9, 11, 13]  # Industry/Innovation, Sustainable Cities, Climate Action
-        },
-        {
-            "id": 15,
-            "title": "Disaster Relief Coordinator",
-            "description": "Coordinates emergency response during disasters, from logistics to shelter.",
-            "interests": ["Global Politics / Civics", "Geography", "Business Studies / Entrepreneurship"],
-            "skills": ["Leading others", "Decision-making", "Helping people", "Resolving conflict"],
-            "sdgs": [3, 11, 16]  # Good Health & Well-Being, Sustainable Cities, Peace & Justice
-        },
-        {
-            "id": 16,
-            "title": "Environmental Data Scientist",
-            "description": "Uses data to predict and respond to environmental and climate issues.",
-            "interests": ["Computer Science / Programming", "Mathematics", "Environmental Systems & Societies / Environmental Science"],
-            "skills": ["Coding", "Data analysis", "Strategic thinking", "Supporting the planet"],
-            "sdgs": [13, 14, 15]  # Climate Action, Life Below Water, Life on Land
-        },
-        {
-            "id": 17,
-            "title": "Food Systems Analyst",
-            "description": "Analyzes global food supply chains and suggests improvements for sustainability.",
-            "interests": ["Agriculture / Sustainable Farming", "Business Studies / Entrepreneurship", "Geography"],
-            "skills": ["Data analysis", "Strategic thinking", "Supporting the planet", "Standing up for causes"],
-            "sdgs": [2, 12, 13]  # Zero Hunger, Responsible Consumption, Climate Action
-        },
-        {
-            "id": 18,
-            "title": "Space Systems Engineer",
-            "description": "Designs satellites and space tech used in communication and climate monitoring.",
-            "interests": ["Physics", "Engineering (General or Applied)", "Mathematics"],
-            "skills": ["Problem solving", "Strategic thinking", "Building or fixing", "Decision-making"],
-            "sdgs": [9, 13, 17]  # Industry/Innovation, Climate Action, Partnerships for Goals
-        },
-        {
-            "id": 19,
-            "title": "AI Engineer",
-            "description": "Develops intelligent systems that power apps, automation, and innovation.",
-            "interests": ["Computer Science / Programming", "Mathematics", "Philosophy"],
-            "skills": ["Coding", "Problem solving", "Strategic thinking", "Data analysis"],
-            "sdgs": [9, 8, 4]  # Industry/Innovation, Decent Work, Quality Education
-        },
-        {
-            "id": 20,
-            "title": "Doctor",
-            "description": "Diagnoses and treats patients, supporting health and well-being.",
-            "interests": ["Biology", "Chemistry", "Health Science / Pre-Med"],
-            "skills": ["Decision-making", "Helping people", "Listening well", "Problem solving"],
-            "sdgs": [3, 5, 10]  # Good Health & Well-Being, Gender Equality, Reduced Inequalities
-        },
-        {
-            "id": 21,
-            "title": "Product Manager",
-            "description": "Leads product teams from idea to launch across industries.",
-            "interests": ["Business Studies / Entrepreneurship", "Psychology", "Design & Technology / Engineering"],
-            "skills": ["Leading others", "Strategic thinking", "Decision-making", "Explaining ideas"],
-            "sdgs": [8, 9, 12]  # Decent Work, Industry/Innovation, Responsible Consumption
-        },
-        {
-            "id": 22,
-            "title": "Graphic Designer",
-            "description": "Creates visual content like logos, posters, and digital assets.",
-            "interests": ["Visual Arts (drawing, painting, sculpture)", "Graphic Design / Digital Media", "Design & Technology / Engineering"],
-            "skills": ["Creative thinking", "Drawing or painting", "Designing digitally", "Explaining ideas"],
-            "sdgs": [8, 9, 12]  # Decent Work, Industry/Innovation, Responsible Consumption
-        },
-        {
-            "id": 23,
-            "title": "Journalist",
-            "description": "Reports and writes news stories for TV, social media, or publications.",
-            "interests": ["English Literature / Language Arts", "Global Politics / Civics", "Psychology"],
-            "skills": ["Writing or storytelling", "Listening well", "Explaining ideas", "Standing up for causes"],
-            "sdgs": [16, 10, 17]  # Peace & Justice, Reduced Inequalities, Partnerships for Goals
-        },
-        {
-            "id": 24,
-            "title": "Investment Banker",
-            "description": "Advises companies on financial deals, growth, and capital strategies.",
-            "interests": ["Economics", "Business Studies / Entrepreneurship", "Mathematics"],
-            "skills": ["Strategic thinking", "Data analysis", "Decision-making", "Explaining ideas"],
-            "sdgs": [8, 9, 17]  # Decent Work, Industry/Innovation, Partnerships for Goals
-        },
-        {
-            "id": 25,
-            "title": "Game Designer",
-            "description": "Builds interactive games for entertainment and education.",
-            "interests": ["Computer Science / Programming", "Visual Arts (drawing, painting, sculpture)", "Psychology"],
-            "skills": ["Creative thinking", "Coding", "Designing digitally", "Writing or storytelling"],
-            "sdgs": [4, 8, 9]  # Quality Education, Decent Work, Industry/Innovation
-        },
-        {
-            "id": 26,
-            "title": "Biotech Researcher",
-            "description": "Develops breakthroughs like vaccines, clean meat, or gene therapy.",
-            "interests": ["Biology", "Chemistry", "Health Science / Pre-Med"],
-            "skills": ["Problem solving", "Data analysis", "Supporting the planet", "Helping people"],
-            "sdgs": [3, 2, 9]  # Good Health, Zero Hunger, Industry/Innovation
-        },
-        {
-            "id": 27,
-            "title": "Neuroscientist",
-            "description": "Studies the human brain to understand memory, emotions, and health.",
-            "interests": ["Biology", "Psychology", "Health Science / Pre-Med"],
-            "skills": ["Data analysis", "Problem solving", "Helping people", "Decision-making"],
-            "sdgs": [3, 9, 10]  # Good Health, Industry/Innovation, Reduced Inequalities
-        },
-        {
-            "id": 28,
-            "title": "UX Designer",
-            "description": "Designs interfaces that make tech easy, ethical, and human-centered.",
-            "interests": ["Psychology", "Graphic Design / Digital Media", "Computer Science / Programming"],
-            "skills": ["Creative thinking", "Designing digitally", "Listening well", "Problem solving"],
-            "sdgs": [9, 10, 4]  # Industry/Innovation, Reduced Inequalities, Quality Education
-        }
-    ]
-    return careers
-
-# Interests data structured by category
-@st.cache_data
-def load_interest_categories():
-    interest_categories = {
-        "Humanities & Social Sciences": [
-            "English Literature / Language Arts",
-            "World Languages (e.g., French, Spanish, Mandarin, Hindi)",
-            "History",
-            "Geography",
-            "Global Politics / Civics",
-            "Philosophy",
-            "Psychology",
-            "Social & Cultural Anthropology",
-            "Economics",
-            "Business Studies / Entrepreneurship",
-            "Ethics / TOK (Theory of Knowledge)"
-        ],
-        "Sciences": [
-            "Biology",
-            "Chemistry",
-            "Physics",
-            "Environmental Systems & Societies / Environmental Science",
-            "General Science / Integrated Science",
-            "Sports, Exercise & Health Science",
-            "Food Science / Food Technology"
-        ],
-        "Math & Technology": [
-            "Mathematics",
-            "Computer Science / Programming",
-            "Design & Technology / Engineering"
-        ],
-        "Arts & Creativity": [
-            "Visual Arts (drawing, painting, sculpture)",
-            "Graphic Design / Digital Media",
-            "Film / Media Studies",
-            "Drama / Theatre",
-            "Music",
-            "Dance"
-        ],
-        "Applied & Vocational": [
-            "Architecture / Interior Design",
-            "Product Design / Industrial Design",
-            "Health Science / Pre-Med",
-            "Agriculture / Sustainable Farming",
-            "Hospitality / Culinary Arts",
-            "Engineering (General or Applied)"
-        ],
-        "Lifestyle & Physical Education": [
-            "Physical Education / Sports Science",
-            "Coaching & Athletics"
-        ]
-    }
-    return interest_categories
-
-# Skills data structured by category
-@st.cache_data
-def load_skill_categories():
-    skill_categories = {
-        "Thinking & Solving": [
-            "Creative thinking",
-            "Problem solving",
-            "Strategic thinking",
-            "Data analysis",
-            "Decision-making"
-        ],
-        "People & Communication": [
-            "Teamwork",
-            "Leading others",
-            "Explaining ideas",
-            "Listening well",
-            "Resolving conflict"
-        ],
-        "Hands-On": [
-            "Building or fixing",
-            "Cooking or crafting",
-            "Working outdoors",
-            "Using tools/machines"
-        ],
-        "Digital Skills": [
-            "Coding",
-            "Designing digitally",
-            "Editing videos",
-            "Working with data",
-            "Troubleshooting tech"
-        ],
-        "Creative Skills": [
-            "Drawing or painting",
-            "Writing or storytelling",
-            "Performing",
-            "Music or audio",
-            "Photography or video"
-        ],
-        "Purpose & Values": [
-            "Helping people",
-            "Supporting the planet",
-            "Standing up for causes",
-            "Understanding cultures",
-            "Working with animals"
-        ]
-    }
-    return skill_categories
-
-# SDGs data
-@st.cache_data
-def load_sdgs():
-    sdgs = [
-        {"id": 1, "name": "No Poverty"},
-        {"id": 2, "name": "Zero Hunger"},
-        {"id": 3, "name": "Good Health & Well-Being"},
-        {"id": 4, "name": "Quality Education"},
-        {"id": 5, "name": "Gender Equality"},
-        {"id": 6, "name": "Clean Water & Sanitation"},
-        {"id": 7, "name": "Affordable & Clean Energy"},
-        {"id": 8, "name": "Decent Work & Economic Growth"},
-        {"id": 9, "name": "Industry, Innovation & Infrastructure"},
-        {"id": 10, "name": "Reduced Inequalities"},
-        {"id": 11, "name": "Sustainable Cities & Communities"},
-        {"id": 12, "name": "Responsible Consumption & Production"},
-        {"id": 13, "name": "Climate Action"},
-        {"id": 14, "name": "Life Below Water"},
-        {"id": 15, "name": "Life on Land"},
-        {"id": 16, "name": "Peace, Justice & Strong Institutions"},
-        {"id": 17, "name": "Partnerships for the Goals"}
-    ]
-    return sdgs
+    limiter, breaker = get_llm_guards()
+    return ResilientClient(
+        llm.create_client(api_key, max_retries=0, timeout=LLM_TIMEOUT), limiter=limiter, breaker=breaker
+    )
+
+# Explanations run on one long-lived event loop so requests outlive the rerun that started them
+@st.cache_resource
+def get_llm_loop():
+    return llm_async.BackgroundLoop()
+
+@st.cache_resource
+def get_async_openai_client():
+    limiter, breaker = get_llm_guards()
+    return AsyncResilientClient(
+        llm_async.create_async_client(st.secrets["openai"]["api_key"], max_retries=0, timeout=LLM_TIMEOUT),
+        limiter=limiter, breaker=breaker
+    )
+
+# Career details depend only on the title, so every session and restart shares one copy
+@st.cache_resource
+def get_detail_cache():
+    return PersistentCache(os.environ.get("LUCIDUS_CACHE_PATH", ".lucidus_cache.sqlite3"))
+
+# Explanations are shared by every session with the same profile
+@st.cache_resource
+def get_explanation_cache():
+    return LRUCache(max_entries=5000, max_bytes=32 * 1024 * 1024)
+
+# Identical OpenAI requests in flight at the same time share one call; the counts are exported with the LLM metrics
+@st.cache_resource
+def get_single_flight():
+    flight = SingleFlight(timeout=float(os.environ.get("LUCIDUS_LLM_WAIT_TIMEOUT", "120")))
+    metrics.REGISTRY.add_collector(flight.to_prometheus)
+    return flight
+
+# Background workers that generate career details before the user asks for them
+@st.cache_resource
+def get_prefetcher():
+    return Prefetcher(max_workers=int(os.environ.get("LUCIDUS_PREFETCH_WORKERS", "4")))
+
+# Pre-generated content from `python -m lucidus.warm`, loaded once per process. An unreadable
+# snapshot is logged and the app starts cold
+@st.cache_resource
+def load_warm_snapshot():
+    path = os.environ.get("LUCIDUS_SNAPSHOT")
+    if not path or not os.path.exists(path):
+        return 0
+    try:
+        return warm.load_snapshot(path, detail_cache=get_detail_cache(), explanation_cache=get_explanation_cache())
+    except (OSError, EOFError, ValueError, KeyError, TypeError, AttributeError) as e:
+        logger.warning("Ignoring warm snapshot %s: %r", path, e)
+        return 0
+
+# Export LLM metrics over HTTP (LUCIDUS_METRICS_PORT) and/or to a Prometheus textfile (LUCIDUS_METRICS_PATH)
+@st.cache_resource
+def start_metrics_export():
+    port = os.environ.get("LUCIDUS_METRICS_PORT")
+    if port:
+        metrics.serve(int(port), host=os.environ.get("LUCIDUS_METRICS_HOST", "127.0.0.1"))
+    path = os.environ.get("LUCIDUS_METRICS_PATH")
+    if path:
+        metrics.write_periodically(path)
+
+def is_active_session(session_id):
+    return not st.runtime.exists() or st.runtime.get_instance().is_active_session(session_id)
+
+# Estimated state size of every live session, shown in the admin panel and exported with the LLM metrics
+@st.cache_resource
+def get_session_memory():
+    memory = SessionMemory()
+
+    def collect():
+        memory.prune(is_active_session)
+        return memory.to_prometheus()
+
+    metrics.REGISTRY.add_collector(collect)
+    return memory
+
+# Ranked matches of popular profiles, shown in the admin panel and exported with the LLM metrics
+@st.cache_resource
+def get_match_memo():
+    memo = MatchMemo(max_entries=MATCH_MEMO_ENTRIES, max_bytes=MATCH_MEMO_BYTES)
+    metrics.REGISTRY.add_collector(memo.to_prometheus)
+    return memo
+
+# Set LUCIDUS_ADMIN=1 to show operational panels in the sidebar
+SHOW_ADMIN = os.environ.get("LUCIDUS_ADMIN", "0") == "1"
+
+# Catalog and taxonomies come from the headless core: the built-in ones, or the JSON, CSV or
+# Parquet files named by LUCIDUS_CATALOG, reloaded when they change
+@st.cache_resource
+def get_catalog_source():
+    path = os.environ.get("LUCIDUS_CATALOG")
+    if not path:
+        return None
+    return CatalogSource(path, check_interval=float(os.environ.get("LUCIDUS_CATALOG_CHECK_INTERVAL", "2")))
+
+@st.cache_resource
+def get_builtin_catalog():
+    return Catalog.builtin()
+
+# Card and tag HTML for the results page, built once per catalog version
+@st.cache_resource(max_entries=4)
+def get_render_cache(_career_catalog, version):
+    return render.RenderCache(_career_catalog)
+
+def load_catalog():
+    """The current catalog version, with its scoring engine and lookup tables"""
+    source = get_catalog_source()
+    return source.get() if source is not None else get_builtin_catalog()
 
 # Initialize session state variables if they don't exist
 if 'step' not in st.session_state:
@@ -504,90 +222,111 @@ if 'desired_skills' not in st.session_state:
     st.session_state.desired_skills = []
 if 'selected_sdgs' not in st.session_state:
     st.session_state.selected_sdgs = []
+# Matches are (career id, score, match mask) tuples; display data comes from the shared catalog
 if 'career_matches' not in st.session_state:
     st.session_state.career_matches = []
-if 'selected_career_details' not in st.session_state:
-    st.session_state.selected_career_details = None
+if 'selected_career' not in st.session_state:
+    st.session_state.selected_career = None
 if 'ai_explanation' not in st.session_state:
-    st.session_state.ai_explanation = {}
+    st.session_state.ai_explanation = LRUCache(max_entries=SESSION_CACHE_ENTRIES, max_bytes=SESSION_CACHE_BYTES)
 if 'detailed_career_info' not in st.session_state:
-    st.session_state.detailed_career_info = {}
+    st.session_state.detailed_career_info = LRUCache(max_entries=SESSION_CACHE_ENTRIES, max_bytes=SESSION_CACHE_BYTES)
+if 'prefetch' not in st.session_state:
+    st.session_state.prefetch = SessionPrefetch(get_prefetcher(), cap=PREFETCH_CAP)
 
 # Load data
-careers = load_career_data()
-interest_categories = load_interest_categories()
-skill_categories = load_skill_categories()
-sdgs = load_sdgs()
+tracing.section("load data")
+current_catalog = load_catalog()
+careers = current_catalog.careers
+interest_categories = current_catalog.interest_categories
+skill_categories = current_catalog.skill_categories
+sdgs = current_catalog.sdgs
+engine = current_catalog.engine
+career_by_id = current_catalog.career_by_id
+sdg_names = current_catalog.sdg_names
+render_cache = get_render_cache(current_catalog, current_catalog.version)
+load_warm_snapshot()
+start_metrics_export()
 
 # AI Functions
-def generate_career_explanation(career, user_interests, current_skills, desired_skills, selected_sdgs):
-    """Generate AI explanation for why a career matches the user's profile"""
-    client = get_openai_client()
-    
-    # Get SDG names for selected SDGs
-    sdg_names = [s["name"] for s in sdgs if s["id"] in selected_sdgs]
-    
-    # Create prompt
-    prompt = f"""
-    As a career advisor, explain why the career '{career['title']}' ({career['description']}) 
-    is a good match for someone with the following profile:
-    
-    Interests: {', '.join(user_interests)}
-    Current Skills: {', '.join(current_skills)}
-    Skills they want to develop: {', '.join(desired_skills)}
-    Values (SDGs they care about): {', '.join(sdg_names)}
-    
-    Identify specific connections between their profile and this career. 
-    Keep your response to 3-4 sentences and focus on how this career aligns with their interests, 
-    leverages their current skills, helps them develop their desired skills, and supports their values.
-    """
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a career advisor who provides concise, personalized explanations."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=200
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        st.error(f"Error generating explanation: {e}")
-        return "Unable to generate explanation at this time."
-
-def get_detailed_career_info(career_title):
+def get_detailed_career_info(career_title, deadline=None, local_text=None):
     """Get detailed information about a career using AI"""
-    client = get_openai_client()
-    
-    prompt = f"""
-    Provide detailed educational and career path information for someone interested in becoming a {career_title}. 
-    Include the following sections:
-    
-    1. School Subjects: List 5-7 specific high school or secondary school subjects that would be most beneficial for this career path.
-    
-    2. Key Skills: List 7-9 specific technical and soft skills needed for success in this career.
-    
-    3. Recommended Online Courses: Suggest 4-5 specific online courses or certifications (with platform names like Coursera, edX, etc.) that would help someone prepare for this career.
-    
-    4. University Majors: List 4-6 specific university majors or degree programs that could lead to this career.
-    
-    Format each section with bullet points for clarity. Be specific, practical, and focused on actionable educational paths.
-    """
-    
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are a career education specialist who provides practical educational guidance."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=700
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        st.error(f"Error getting career details: {e}")
-        return "Unable to retrieve detailed information at this time."
+    return llm.get_detailed_career_info(
+        get_openai_client(), career_title, on_error=st.error, cache=get_detail_cache(), flight=get_single_flight(),
+        deadline=deadline, local_text=local_text
+    )
+
+def explanation_slot(career, pending):
+    """Placeholder for a career's AI explanation; uncached ones are queued in `pending`"""
+    slot = st.empty()
+    text = st.session_state.ai_explanation.get(explanation_key(career))
+    if text is not None:
+        slot.markdown(text)
+    else:
+        slot.caption("Generating AI analysis...")
+        pending[career["id"]] = (career, slot)
+
+@tracing.traced()
+def fill_explanations(pending):
+    """Generate every queued explanation concurrently, filling each slot as it completes"""
+    if not pending:
+        return
+    profile = (
+        st.session_state.selected_interests,
+        st.session_state.current_skills,
+        st.session_state.desired_skills,
+        st.session_state.selected_sdgs
+    )
+    events = llm_async.explain_careers_within(
+        get_llm_loop(), get_async_openai_client(), [career for career, _ in pending.values()], *profile,
+        deadline=LLM_DEADLINE, sdgs=sdgs, concurrency=LLM_CONCURRENCY, cache=get_explanation_cache(),
+        stream=STREAM_LLM, flight=get_single_flight()
+    )
+    for event, career, text in events:
+        if event == "error":
+            st.error(text)
+        elif event == "chunk":
+            pending[career["id"]][1].markdown(text + " ▌")
+        elif event == "done":
+            pending[career["id"]][1].markdown(text)
+            st.session_state.ai_explanation.set(explanation_key(career), text)
+        else:
+            # Out of time: show a local summary, and leave the key unset so the next view picks up the AI text
+            pending[career["id"]][1].markdown(text)
+
+@tracing.traced()
+def render_career_info(career_details):
+    """Show detailed career information, streaming it in on first view"""
+    if career_details["info"] is not None:
+        st.markdown(career_details["info"], unsafe_allow_html=True)
+        return
+    local_text = llm.local_career_info(career_by_id[career_details["id"]], sdgs)
+    # Hand off to a prefetch that is still running rather than asking twice
+    info = None
+    future = get_prefetcher().in_flight(llm.detail_cache_key(career_details["title"]))
+    if future is not None:
+        try:
+            with st.spinner(f"Gathering information about {career_details['title']}..."):
+                info = future.result(timeout=LLM_DEADLINE)
+        except concurrent.futures.TimeoutError:
+            info = local_text
+        except concurrent.futures.CancelledError:
+            pass
+    if info is not None:
+        st.markdown(info, unsafe_allow_html=True)
+    elif STREAM_LLM:
+        info = st.write_stream(llm.stream_detailed_career_info(
+            get_openai_client(), career_details["title"], on_error=st.error, cache=get_detail_cache(),
+            flight=get_single_flight(), deadline=LLM_DEADLINE, local_text=local_text
+        ))
+    else:
+        with st.spinner(f"Gathering information about {career_details['title']}..."):
+            info = get_detailed_career_info(career_details["title"], deadline=LLM_DEADLINE, local_text=local_text)
+        st.markdown(info, unsafe_allow_html=True)
+    if info == local_text:
+        # The AI text is still being generated; the next view reads it from the cache
+        return
+    st.session_state.detailed_career_info.set(llm.detail_cache_key(career_details["title"]), info)
 
 # Helper functions
 def handle_interest_select(interest):
@@ -618,89 +357,113 @@ def handle_sdg_select(sdg_id):
         if len(st.session_state.selected_sdgs) < 3:
             st.session_state.selected_sdgs.append(sdg_id)
 
+def explanation_key(career):
+    """Explanation cache key for a career and the current profile"""
+    return llm.explanation_cache_key(
+        career,
+        st.session_state.selected_interests,
+        st.session_state.current_skills,
+        st.session_state.desired_skills,
+        st.session_state.selected_sdgs
+    )
+
+@tracing.traced()
+def prefetch_career_details(career_ids):
+    """Generate details for these careers in the background, cancelling other queued prefetches"""
+    client = get_openai_client()
+    cache = get_detail_cache()
+    flight = get_single_flight()
+    keys = []
+    for career_id in career_ids:
+        career = career_by_id.get(career_id)
+        if career is None:
+            continue
+        key = llm.detail_cache_key(career["title"])
+        if key in st.session_state.detailed_career_info:
+            continue
+        keys.append(key)
+        st.session_state.prefetch.submit(
+            key, llm.get_detailed_career_info, client, career["title"], cache=cache, flight=flight
+        )
+    st.session_state.prefetch.cancel(keep=keys)
+
+def prefetch_likely_matches():
+    """Speculatively prefetch details for the best matches of the profile so far"""
+    if st.session_state.selected_sdgs:
+        # The full top 6, so the results page finds this profile in the memo
+        _, likely = get_match_memo().compact_matches(
+            current_catalog,
+            st.session_state.selected_interests,
+            st.session_state.current_skills,
+            st.session_state.desired_skills,
+            st.session_state.selected_sdgs,
+            limit=6,
+            source="prefetch"
+        )
+        prefetch_career_details([career_id for career_id, _, _ in likely[:3]])
+
+@tracing.traced()
 def match_careers():
-    # Score each career based on matches
-    scored_careers = []
-    
-    for career in careers:
-        score = 0
-        match_details = {
-            "interest_matches": [],
-            "skill_matches": {
-                "current": [],
-                "desired": []
-            },
-            "sdg_matches": []
-        }
-        
-        # Score for matching interests (highest weight)
-        for interest in st.session_state.selected_interests:
-            if interest in career["interests"]:
-                score += 3
-                match_details["interest_matches"].append(interest)
-        
-        # Score for matching current skills
-        for skill in st.session_state.current_skills:
-            if skill in career["skills"]:
-                score += 2
-                match_details["skill_matches"]["current"].append(skill)
-        
-        # Score for matching desired skills (lower weight than current)
-        for skill in st.session_state.desired_skills:
-            if skill in career["skills"]:
-                score += 1
-                match_details["skill_matches"]["desired"].append(skill)
-        
-        # Score for matching SDGs (high weight - values are important)
-        for sdg_id in st.session_state.selected_sdgs:
-            if sdg_id in career["sdgs"]:
-                score += 3
-                match_details["sdg_matches"].append(sdg_id)
-        
-        career_with_score = career.copy()
-        career_with_score["score"] = score
-        career_with_score["match_details"] = match_details
-        scored_careers.append(career_with_score)
-    
-    # Sort by score and take top 6
-    top_matches = sorted(
-        [c for c in scored_careers if c["score"] > 0],
-        key=lambda x: x["score"],
-        reverse=True
-    )[:6]
+    # Ids, scores and match masks of the top 6, shared with every session that picked the same profile
+    _, top_matches = get_match_memo().compact_matches(
+        current_catalog,
+        st.session_state.selected_interests,
+        st.session_state.current_skills,
+        st.session_state.desired_skills,
+        st.session_state.selected_sdgs,
+        limit=6
+    )
     
     st.session_state.career_matches = top_matches
     
-    # Generate AI explanation for the top match
-    if top_matches:
-        top_career = top_matches[0]
-        if top_career["id"] not in st.session_state.ai_explanation:
-            explanation = generate_career_explanation(
-                top_career, 
-                st.session_state.selected_interests,
-                st.session_state.current_skills,
-                st.session_state.desired_skills,
-                st.session_state.selected_sdgs
-            )
-            st.session_state.ai_explanation[top_career["id"]] = explanation
+    # Users usually explore one of the displayed matches next
+    prefetch_career_details([career_id for career_id, _, _ in top_matches])
     
+    # The top match's AI explanation is generated when the results page renders
     st.session_state.step = 4
 
 def get_career_details(career):
-    """Get or generate detailed information about a career"""
-    if career["id"] not in st.session_state.detailed_career_info:
-        # Show spinner while loading
-        with st.spinner(f"Gathering information about {career['title']}..."):
-            info = get_detailed_career_info(career["title"])
-            st.session_state.detailed_career_info[career["id"]] = info
-    
-    st.session_state.selected_career_details = {
+    """Select a career for the detail view; its information is generated on render"""
+    st.session_state.selected_career = career["id"]
+
+def selected_career_details():
+    """Display data of the career picked for the detail view, or None if the catalog no longer has it"""
+    career = career_by_id.get(st.session_state.selected_career)
+    if career is None:
+        return None
+    return {
         "id": career["id"],
         "title": career["title"],
         "description": career["description"],
-        "info": st.session_state.detailed_career_info[career["id"]]
+        "info": st.session_state.detailed_career_info.get(llm.detail_cache_key(career["title"]))
     }
 
+def displayed_matches():
+    """The session's matches with their catalog data and match details, skipping careers since removed"""
+    selections = (
+        st.session_state.selected_interests,
+        st.session_state.current_skills,
+        st.session_state.desired_skills,
+        st.session_state.selected_sdgs
+    )
+    # Memoized masks refer to the ids of the canonical profile; details are shown in selection order
+    profile = Profile.from_selections(current_catalog.taxonomy, *selections).canonical().labels(current_catalog.taxonomy)
+    matches = []
+    for career_id, score, mask in st.session_state.career_matches:
+        career = career_by_id.get(career_id)
+        if career is None:
+            continue
+        matches.append({
+            "id": career_id,
+            "title": career["title"],
+            "description": career["description"],
+            "score": score,
+            "match_details": scoring.order_match_details(
+                scoring.unpack_match_details(mask, *profile), *selections
+            ),
+        })
+    return matches
+
 def restart():
     st.session_state.step = 1
     st.session_state.selected_interests = []
@@ -708,24 +471,160 @@ def restart():
     st.session_state.desired_skills = []
     st.session_state.selected_sdgs = []
     st.session_state.career_matches = []
-    st.session_state.selected_career_details = None
+    st.session_state.selected_career = None
     # Keep AI explanations and career details cached
 
+def step_ready():
+    """Whether the current step's selections are complete enough to move on"""
+    if st.session_state.step == 1:
+        return len(st.session_state.selected_interests) == 3
+    if st.session_state.step == 2:
+        return len(st.session_state.current_skills) == 3 and len(st.session_state.desired_skills) == 3
+    if st.session_state.step == 3:
+        return len(st.session_state.selected_sdgs) > 0
+    return False
+
 def go_to_next_step():
-    if st.session_state.step == 1 and len(st.session_state.selected_interests) == 3:
+    if not step_ready():
+        return
+    if st.session_state.step == 1:
         st.session_state.step = 2
-    elif st.session_state.step == 2 and len(st.session_state.current_skills) == 3 and len(st.session_state.desired_skills) == 3:
+    elif st.session_state.step == 2:
         st.session_state.step = 3
-    elif st.session_state.step == 3 and len(st.session_state.selected_sdgs) > 0:
+    elif st.session_state.step == 3:
         match_careers()
 
-def get_sdg_names(sdg_ids):
-    return [sdg["name"] for sdg in sdgs if sdg["id"] in sdg_ids]
+def selection_grid(fn):
+    """Run a selection grid as a fragment, so toggling a button reruns only the grid and its counter.
+
+    Buttons toggle through on_click callbacks, which run before the
+    fragment redraws. The step's navigation buttons sit outside the
+    fragment, so when a toggle completes or un-completes the step the
+    whole app reruns to enable or disable them. A fragment rerun is traced
+    on its own when tracing is on.
+    """
+    @st.fragment
+    @functools.wraps(fn)
+    def fragment(*args):
+        if tracer is not None and tracing.current() is None:
+            trace = tracer.start("fragment", step=st.session_state.step, fragment=fn.__name__)
+            try:
+                run(*args)
+            finally:
+                tracer.finish(trace)
+        else:
+            with tracing.span(fn.__name__, "fragment"):
+                run(*args)
+
+    def run(*args):
+        fn(*args)
+        if st.session_state.get("step_ready") != step_ready():
+            st.rerun()
+
+    return fragment
+
+def selected_caption(selections, **facets):
+    """Selection count, with how many careers have every selection of the grid"""
+    caption = f"Selected: {len(selections)}/3"
+    if selections:
+        caption += f" · {len(engine.candidates(match_all=True, **facets))} careers have all of them"
+    return caption
+
+@selection_grid
+def interest_grid():
+    for category, interests in interest_categories.items():
+        with st.expander(f"{category}"):
+            col1, col2 = st.columns(2)
+            
+            half_length = len(interests) // 2 + len(interests) % 2
+            
+            for column, column_interests in ((col1, interests[:half_length]), (col2, interests[half_length:])):
+                for interest in column_interests:
+                    with column:
+                        selected = interest in st.session_state.selected_interests
+                        st.button(
+                            f"{'✓ ' if selected else ''}{interest} ({engine.interest_counts.get(interest, 0)})",
+                            key=f"int_{interest}",
+                            help=f"{engine.interest_counts.get(interest, 0)} careers use this",
+                            type="primary" if selected else "secondary",
+                            use_container_width=True,
+                            on_click=handle_interest_select,
+                            args=(interest,)
+                        )
+    
+    st.write(selected_caption(st.session_state.selected_interests, interests=st.session_state.selected_interests))
+    if st.session_state.selected_interests:
+        st.write("Your selections:")
+        for interest in st.session_state.selected_interests:
+            st.markdown(f"- {interest}")
+
+@selection_grid
+def skill_grid(state_key, key_prefix, handle_select, selections_caption):
+    selected_skills = st.session_state[state_key]
+    for category, skills in skill_categories.items():
+        with st.expander(f"{category}"):
+            col1, col2 = st.columns(2)
+            
+            half_length = len(skills) // 2 + len(skills) % 2
+            
+            for column, column_skills in ((col1, skills[:half_length]), (col2, skills[half_length:])):
+                for skill in column_skills:
+                    with column:
+                        selected = skill in selected_skills
+                        st.button(
+                            f"{'✓ ' if selected else ''}{skill} ({engine.skill_counts.get(skill, 0)})",
+                            key=f"{key_prefix}_{skill}",
+                            help=f"{engine.skill_counts.get(skill, 0)} careers use this",
+                            type="primary" if selected else "secondary",
+                            use_container_width=True,
+                            on_click=handle_select,
+                            args=(skill,)
+                        )
+    
+    st.write(selected_caption(selected_skills, current_skills=selected_skills))
+    if selected_skills:
+        st.write(selections_caption)
+        for skill in selected_skills:
+            st.markdown(f"- {skill}")
+
+def toggle_sdg(sdg_id):
+    handle_sdg_select(sdg_id)
+    prefetch_likely_matches()
+
+@selection_grid
+def sdg_grid():
+    # Create 3 columns and divide SDGs among them
+    col1, col2, col3 = st.columns(3)
+    columns = [col1, col2, col3]
+    
+    sdgs_per_column = len(sdgs) // 3 + (1 if len(sdgs) % 3 > 0 else 0)
+    
+    for i, sdg in enumerate(sdgs):
+        col_index = i // sdgs_per_column
+        with columns[col_index]:
+            selected = sdg["id"] in st.session_state.selected_sdgs
+            st.button(
+                f"{sdg['id']}. {'✓ ' if selected else ''}{sdg['name']} ({engine.sdg_counts.get(sdg['id'], 0)})",
+                key=f"sdg_{sdg['id']}",
+                help=f"{engine.sdg_counts.get(sdg['id'], 0)} careers use this",
+                type="primary" if selected else "secondary",
+                use_container_width=True,
+                on_click=toggle_sdg,
+                args=(sdg["id"],)
+            )
+    
+    st.markdown("---")
+    st.write(selected_caption(st.session_state.selected_sdgs, selected_sdgs=st.session_state.selected_sdgs))
+    if st.session_state.selected_sdgs:
+        st.write("Your values:")
+        for sdg_id in st.session_state.selected_sdgs:
+            st.markdown(f"- SDG {sdg_id}: {sdg_names.get(sdg_id, '')}")
 
 def back_to_results():
-    st.session_state.selected_career_details = None
+    st.session_state.selected_career = None
 
 # Header
+tracing.section(f"step {st.session_state.step}")
 st.title("Career Discovery Algorithm")
 st.write("Find careers that match your interests, skills, and values")
 
@@ -769,47 +668,12 @@ if st.session_state.step == 1:
         st.markdown('<h2 class="step-header" style="background-color: #e3f2fd; color: #1565c0;">Step 1: Select 3 Interests</h2>', unsafe_allow_html=True)
         st.write("Choose three subjects that you enjoy the most in school.")
         
-        for category, interests in interest_categories.items():
-            with st.expander(f"{category}"):
-                col1, col2 = st.columns(2)
-                
-                half_length = len(interests) // 2 + len(interests) % 2
-                
-                for i, interest in enumerate(interests[:half_length]):
-                    with col1:
-                        selected = interest in st.session_state.selected_interests
-                        if st.button(
-                            f"{'✓ ' if selected else ''}{interest}",
-                            key=f"int_{interest}",
-                            type="primary" if selected else "secondary",
-                            use_container_width=True
-                        ):
-                            handle_interest_select(interest)
-                            st.rerun()
-                
-                for i, interest in enumerate(interests[half_length:]):
-                    with col2:
-                        selected = interest in st.session_state.selected_interests
-                        if st.button(
-                            f"{'✓ ' if selected else ''}{interest}",
-                            key=f"int_{interest}",
-                            type="primary" if selected else "secondary",
-                            use_container_width=True
-                        ):
-                            handle_interest_select(interest)
-                            st.rerun()
+        st.session_state.step_ready = step_ready()
+        interest_grid()
         
-        col1, col2 = st.columns([3, 1])
-        with col1:
-            st.write(f"Selected: {len(st.session_state.selected_interests)}/3")
-            if st.session_state.selected_interests:
-                st.write("Your selections:")
-                for interest in st.session_state.selected_interests:
-                    st.markdown(f"- {interest}")
-        with col2:
-            if st.button("Next: Skills", disabled=len(st.session_state.selected_interests) != 3, type="primary", use_container_width=True):
-                go_to_next_step()
-                st.rerun()
+        if st.button("Next: Skills", disabled=len(st.session_state.selected_interests) != 3, type="primary", use_container_width=True):
+            go_to_next_step()
+            st.rerun()
         st.markdown('</div>', unsafe_allow_html=True)
 
 # Step 2: Skills
@@ -818,83 +682,17 @@ elif st.session_state.step == 2:
         st.markdown('<div class="step-container">', unsafe_allow_html=True)
         st.markdown('<h2 class="step-header" style="background-color: #e8f5e9; color: #2e7d32;">Step 2: Select Your Skills</h2>', unsafe_allow_html=True)
         
+        st.session_state.step_ready = step_ready()
+        
         # Current skills selection
         st.markdown("### Select 3 skills you're good at:")
-        for category, skills in skill_categories.items():
-            with st.expander(f"{category}"):
-                col1, col2 = st.columns(2)
-                
-                half_length = len(skills) // 2 + len(skills) % 2
-                
-                for i, skill in enumerate(skills[:half_length]):
-                    with col1:
-                        selected = skill in st.session_state.current_skills
-                        if st.button(
-                            f"{'✓ ' if selected else ''}{skill}",
-                            key=f"current_{skill}",
-                            type="primary" if selected else "secondary",
-                            use_container_width=True
-                        ):
-                            handle_current_skill_select(skill)
-                            st.rerun()
-                
-                for i, skill in enumerate(skills[half_length:]):
-                    with col2:
-                        selected = skill in st.session_state.current_skills
-                        if st.button(
-                            f"{'✓ ' if selected else ''}{skill}",
-                            key=f"current_{skill}",
-                            type="primary" if selected else "secondary",
-                            use_container_width=True
-                        ):
-                            handle_current_skill_select(skill)
-                            st.rerun()
-        
-        st.write(f"Selected: {len(st.session_state.current_skills)}/3")
-        if st.session_state.current_skills:
-            st.write("Your current skills:")
-            for skill in st.session_state.current_skills:
-                st.markdown(f"- {skill}")
+        skill_grid("current_skills", "current", handle_current_skill_select, "Your current skills:")
         
         st.markdown("---")
         
         # Desired skills selection
         st.markdown("### Select 3 skills you'd like to improve:")
-        for category, skills in skill_categories.items():
-            with st.expander(f"{category}"):
-                col1, col2 = st.columns(2)
-                
-                half_length = len(skills) // 2 + len(skills) % 2
-                
-                for i, skill in enumerate(skills[:half_length]):
-                    with col1:
-                        selected = skill in st.session_state.desired_skills
-                        if st.button(
-                            f"{'✓ ' if selected else ''}{skill}",
-                            key=f"desired_{skill}",
-                            type="primary" if selected else "secondary",
-                            use_container_width=True
-                        ):
-                            handle_desired_skill_select(skill)
-                            st.rerun()
-                
-                for i, skill in enumerate(skills[half_length:]):
-                    with col2:
-                        selected = skill in st.session_state.desired_skills
-                        if st.button(
-                            f"{'✓ ' if selected else ''}{skill}",
-                            key=f"desired_{skill}",
-                            type="primary" if selected else "secondary",
-                            use_container_width=True
-                        ):
-                            handle_desired_skill_select(skill)
-                            st.rerun()
-        
-        st.write(f"Selected: {len(st.session_state.desired_skills)}/3")
-        if st.session_state.desired_skills:
-            st.write("Skills you want to improve:")
-            for skill in st.session_state.desired_skills:
-                st.markdown(f"- {skill}")
+        skill_grid("desired_skills", "desired", handle_desired_skill_select, "Skills you want to improve:")
         
         col1, col2 = st.columns([1, 3])
         with col1:
@@ -919,32 +717,8 @@ elif st.session_state.step == 3:
         st.markdown('<h2 class="step-header" style="background-color: #ede7f6; color: #5e35b1;">Step 3: Select Your Values</h2>', unsafe_allow_html=True)
         st.write("Choose up to 3 UN Sustainable Development Goals that you value most.")
         
-        # Create 3 columns and divide SDGs among them
-        col1, col2, col3 = st.columns(3)
-        columns = [col1, col2, col3]
-        
-        sdgs_per_column = len(sdgs) // 3 + (1 if len(sdgs) % 3 > 0 else 0)
-        
-        for i, sdg in enumerate(sdgs):
-            col_index = i // sdgs_per_column
-            with columns[col_index]:
-                selected = sdg["id"] in st.session_state.selected_sdgs
-                if st.button(
-                    f"{sdg['id']}. {'✓ ' if selected else ''}{sdg['name']}",
-                    key=f"sdg_{sdg['id']}",
-                    type="primary" if selected else "secondary",
-                    use_container_width=True
-                ):
-                    handle_sdg_select(sdg["id"])
-                    st.rerun()
-        
-        st.markdown("---")
-        st.write(f"Selected: {len(st.session_state.selected_sdgs)}/3")
-        if st.session_state.selected_sdgs:
-            st.write("Your values:")
-            sdg_names = get_sdg_names(st.session_state.selected_sdgs)
-            for i, name in enumerate(sdg_names):
-                st.markdown(f"- SDG {st.session_state.selected_sdgs[i]}: {name}")
+        st.session_state.step_ready = step_ready()
+        sdg_grid()
         
         col1, col2 = st.columns([1, 3])
         with col1:
@@ -964,9 +738,9 @@ elif st.session_state.step == 3:
 
 # Step 4: Results
 elif st.session_state.step == 4:
-    if st.session_state.selected_career_details:
+    career_details = selected_career_details()
+    if career_details:
         # Display detailed career view
-        career_details = st.session_state.selected_career_details
         
         with st.container():
             st.markdown('<div class="step-container">', unsafe_allow_html=True)
@@ -978,12 +752,12 @@ elif st.session_state.step == 4:
                     back_to_results()
                     st.rerun()
             with col2:
-                st.markdown(f"<h2>{career_details['title']}</h2>", unsafe_allow_html=True)
+                st.markdown(f"<h2>{html.escape(career_details['title'])}</h2>", unsafe_allow_html=True)
             
-            st.markdown(f"<p><em>{career_details['description']}</em></p>", unsafe_allow_html=True)
+            st.markdown(f"<p><em>{html.escape(career_details['description'])}</em></p>", unsafe_allow_html=True)
             
             # Display AI-generated career information
-            st.markdown(career_details["info"], unsafe_allow_html=True)
+            render_career_info(career_details)
             
             st.markdown('</div>', unsafe_allow_html=True)
     else:
@@ -993,49 +767,37 @@ elif st.session_state.step == 4:
             st.markdown('<h2 class="step-header" style="background-color: #e1f5fe; color: #0277bd;">Your Career Matches</h2>', unsafe_allow_html=True)
             st.write("Based on your interests, skills, and values, here are your top career matches:")
             
-            if st.session_state.career_matches:
+            # Explanations not yet generated, filled in together once the page is drawn
+            pending_explanations = {}
+            
+            career_matches = displayed_matches()
+            if career_matches:
                 # Display top match with special emphasis
-                top_match = st.session_state.career_matches[0]
+                top_match = career_matches[0]
                 st.markdown("## 🏆 Top Career Match")
                 
                 # Create a clean card for the top match
-                st.markdown(
-                    f"""
-                    <div class="career-card" style="border: 2px solid #1976d2; border-radius: 0.5rem; margin-bottom: 2rem;">
-                        <div style="background-color: #1976d2; color: white; padding: 1rem; border-radius: 0.5rem 0.5rem 0 0;">
-                            <h3 style="margin: 0;">{top_match['title']}</h3>
-                        </div>
-                        <div style="padding: 1rem;">
-                            <p>{top_match['description']}</p>
-                        </div>
-                    </div>
-                    """, 
-                    unsafe_allow_html=True
-                )
+                st.markdown(render_cache.top_card(top_match["id"]), unsafe_allow_html=True)
                 
                 # Display AI explanation for the top match
-                if top_match["id"] in st.session_state.ai_explanation:
-                    st.markdown('<div class="ai-analysis">', unsafe_allow_html=True)
-                    st.markdown("### 🤖 AI Career Analysis")
-                    st.markdown(st.session_state.ai_explanation[top_match["id"]])
-                    st.markdown('</div>', unsafe_allow_html=True)
+                st.markdown('<div class="ai-analysis">', unsafe_allow_html=True)
+                st.markdown("### 🤖 AI Career Analysis")
+                explanation_slot(top_match, pending_explanations)
+                st.markdown('</div>', unsafe_allow_html=True)
                 
                 # Display interests separately
                 st.markdown("<strong style='color: #1565c0;'>Key Interests:</strong>", unsafe_allow_html=True)
-                interests_html = " ".join([f"<span class='tag interest-tag'>{interest}</span>" 
-                                        for interest in top_match['match_details']['interest_matches']])
+                interests_html = render_cache.interests(top_match['match_details']['interest_matches'])
                 st.markdown(f"<div>{interests_html}</div>", unsafe_allow_html=True)
                 
                 # Display skills separately
                 st.markdown("<strong style='color: #2e7d32;'>Key Skills:</strong>", unsafe_allow_html=True)
-                skills_html = " ".join([f"<span class='tag skill-tag'>{skill}</span>" 
-                                      for skill in top_match['match_details']['skill_matches']['current']])
+                skills_html = render_cache.skills(top_match['match_details']['skill_matches']['current'])
                 st.markdown(f"<div>{skills_html}</div>", unsafe_allow_html=True)
                 
                 # Display SDGs separately
                 st.markdown("<strong style='color: #5e35b1;'>SDG Impact:</strong>", unsafe_allow_html=True)
-                sdgs_html = " ".join([f"<span class='tag sdg-tag'>SDG {sdg_id}: {[s['name'] for s in sdgs if s['id'] == sdg_id][0]}</span>" 
-                                    for sdg_id in top_match['match_details']['sdg_matches']])
+                sdgs_html = render_cache.sdgs(top_match['match_details']['sdg_matches'])
                 st.markdown(f"<div>{sdgs_html}</div>", unsafe_allow_html=True)
                 
                 # Add button to explore this career
@@ -1047,7 +809,7 @@ elif st.session_state.step == 4:
                 st.markdown("## Other Great Matches")
                 
                 # Create rows of 3 columns for the remaining matches
-                other_matches = st.session_state.career_matches[1:]
+                other_matches = career_matches[1:]
                 
                 for i in range(0, len(other_matches), 3):
                     cols = st.columns(3)
@@ -1056,32 +818,21 @@ elif st.session_state.step == 4:
                             career = other_matches[i + j]
                             with cols[j]:
                                 # Display title and description
-                                st.markdown(
-                                    f"""
-                                    <div class="career-card" style="border: 1px solid #ddd; border-radius: 0.5rem; margin-bottom: 1rem; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
-                                        <div style="background-color: #1976d2; color: white; padding: 0.7rem; border-radius: 0.5rem 0.5rem 0 0;">
-                                            <h4 style="margin: 0; font-size: 1.1rem;">{career['title']}</h4>
-                                        </div>
-                                        <div style="padding: 0.7rem;">
-                                            <p style="font-size: 0.9rem;">{career['description']}</p>
-                                        </div>
-                                    </div>
-                                    """, 
-                                    unsafe_allow_html=True
-                                )
+                                st.markdown(render_cache.card(career["id"]), unsafe_allow_html=True)
                                 
                                 # Display interests
                                 st.markdown("<strong style='color: #1565c0; font-size: 0.8rem;'>Key Interests:</strong>", unsafe_allow_html=True)
-                                interests = " ".join([f"<span style='background-color: #e1f5fe; color: #0277bd; border-radius: 1rem; padding: 0.2rem 0.6rem; margin-right: 0.3rem; margin-bottom: 0.3rem; display: inline-block; font-size: 0.8rem;'>{interest}</span>" 
-                                                   for interest in career['match_details']['interest_matches'][:2]])
+                                interests = render_cache.interests(career['match_details']['interest_matches'][:2])
                                 st.markdown(f"<div>{interests}</div>", unsafe_allow_html=True)
                                 
                                 # Display skills
                                 st.markdown("<strong style='color: #2e7d32; font-size: 0.8rem;'>Key Skills:</strong>", unsafe_allow_html=True)
-                                skills = " ".join([f"<span style='background-color: #e8f5e9; color: #2e7d32; border-radius: 1rem; padding: 0.2rem 0.6rem; margin-right: 0.3rem; margin-bottom: 0.3rem; display: inline-block; font-size: 0.8rem;'>{skill}</span>" 
-                                                for skill in career['match_details']['skill_matches']['current'][:2]])
+                                skills = render_cache.skills(career['match_details']['skill_matches']['current'][:2])
                                 st.markdown(f"<div>{skills}</div>", unsafe_allow_html=True)
                                 
+                                # AI explanation for this match
+                                explanation_slot(career, pending_explanations)
+                                
                                 # Add button to explore this career
                                 if st.button("Explore", key=f"explore_{career['id']}"):
                                     get_career_details(career)
@@ -1093,7 +844,71 @@ elif st.session_state.step == 4:
                 restart()
                 st.rerun()
             st.markdown('</div>', unsafe_allow_html=True)
+            
+            fill_explanations(pending_explanations)
 
 # Footer
+tracing.section("footer")
 st.markdown("---")
 st.markdown("Career Algorithm &copy; 2025 | Find your impact-driven career path")
+
+# Record this session's state size once the run has stored everything in it
+tracing.section("session memory")
+session_memory = get_session_memory()
+script_run_ctx = get_script_run_ctx()
+if script_run_ctx is not None:
+    session_memory.record(script_run_ctx.session_id, estimate_bytes(
+        {key: value for key, value in st.session_state.to_dict().items() if key != "_trace"}
+    ))
+
+# Admin panel, drawn last so it includes this run's calls
+if SHOW_ADMIN:
+    tracing.section("admin")
+    with st.sidebar.expander("Session memory", expanded=False):
+        session_memory.prune(is_active_session)
+        memory_summary = session_memory.summary()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Live sessions", memory_summary["sessions"])
+        col2.metric("Mean per session", f"{memory_summary['mean_bytes'] / 1024:.1f} KiB")
+        col3.metric("Total", f"{memory_summary['total_bytes'] / 2**20:.2f} MiB")
+        st.caption(f"Largest session: {memory_summary['max_bytes'] / 1024:.1f} KiB (estimated)")
+    with st.sidebar.expander("Match memo", expanded=False):
+        memo_summary = get_match_memo().summary()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Profiles", memo_summary["entries"])
+        col2.metric("Hit rate", f"{memo_summary['hit_rate']:.0%}")
+        col3.metric("Size", f"{memo_summary['bytes'] / 2**20:.2f} MiB")
+        prefetch_summary = get_match_memo().summary("prefetch")
+        st.caption(
+            f"Results: {memo_summary['hits']} hits, {memo_summary['misses']} misses. "
+            f"Step 3 prefetch: {prefetch_summary['hits']} hits, {prefetch_summary['misses']} misses"
+        )
+    with st.sidebar.expander("LLM usage", expanded=False):
+        usage = metrics.REGISTRY.summary()
+        if usage:
+            st.dataframe(pd.DataFrame([
+                {
+                    "kind": kind,
+                    "calls": stats["calls"],
+                    "errors": sum(stats["errors"].values()),
+                    "cache hit rate": stats["cache_hits"] / max(1, stats["cache_hits"] + stats["cache_misses"]),
+                    "p50 s": stats["latency"]["p50"],
+                    "p95 s": stats["latency"]["p95"],
+                    "p99 s": stats["latency"]["p99"],
+                    "TTFT p50 s": stats["first_token"]["p50"],
+                    "prompt tokens": stats["prompt_tokens"],
+                    "completion tokens": stats["completion_tokens"],
+                    "cost $": round(stats["cost_usd"], 4),
+                }
+                for kind, stats in usage.items()
+            ]), hide_index=True)
+        else:
+            st.caption("No LLM calls yet")
+        flight_summary = get_single_flight().summary()
+        st.caption(
+            f"Shared requests: {flight_summary['calls']} calls, {flight_summary['coalesced']} coalesced "
+            f"({flight_summary['coalesced_rate']:.0%}), {flight_summary['in_flight']} in flight"
+        )
+
+if tracer is not None:
+    tracer.finish(st.session_state.pop("_trace"), final_step=st.session_state.step)
@@ -0,0 +1,46 @@
+"""Headless core of the Career Discovery app.
+
+The catalog, scoring engine and LLM helpers live here without any Streamlit
+dependency, so they can run in workers, batch jobs and benchmarks. Submodules
+are imported on first attribute access to keep ``import lucidus`` cheap.
+"""
+import importlib
+
+_EXPORTS = {
+    "load_career_data": "catalog",
+    "load_interest_categories": "catalog",
+    "load_skill_categories": "catalog",
+    "load_sdgs": "catalog",
+    "get_sdg_names": "catalog",
+    "Catalog": "catalog_source",
+    "CatalogError": "catalog_source",
+    "CatalogSource": "catalog_source",
+    "load_catalog": "catalog_source",
+    "compile_catalog": "compiled",
+    "open_compiled": "compiled",
+    "Career": "records",
+    "Profile": "records",
+    "Taxonomy": "records",
+    "MatchMemo": "match_memo",
+    "RenderCache": "render",
+    "MATCH_WEIGHTS": "scoring",
+    "CareerScoringEngine": "scoring",
+    "default_engine": "scoring",
+    "match_careers": "scoring",
+    "create_client": "llm",
+    "generate_career_explanation": "llm",
+    "get_detailed_career_info": "llm",
+    "stream_career_explanation": "llm",
+    "stream_detailed_career_info": "llm",
+    "create_async_client": "llm_async",
+    "explain_careers": "llm_async",
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{_EXPORTS[name]}"), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,240 @@
+"""Batch career matching for whole cohorts of student profiles.
+
+Profiles are streamed from CSV or JSONL, scored in chunks across a process
+pool and written out incrementally, so memory stays flat however large the
+input is::
+
+    python -m lucidus.batch profiles.csv -o matches.jsonl --workers 8 --skip-llm
+
+CSV input needs the columns ``id``, ``interests``, ``current_skills``,
+``desired_skills`` and ``sdgs``, with multiple values separated by ``;``.
+JSONL input uses the same keys with lists as values. An optional ``count``
+column says how many students share a profile; it is copied to the output
+and weights the student total, and ``lucidus.warm`` uses it to pick the
+most common profiles.
+"""
+import argparse
+import collections
+import concurrent.futures
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+
+from lucidus import catalog, llm, scoring
+from lucidus.catalog_source import CatalogError, load_catalog
+
+CSV_OUTPUT_FIELDS = ("profile_id", "count", "rank", "career_id", "title", "score", "explanation")
+
+# Per-process state set up by _init_worker
+_worker = {}
+
+def _split(value):
+    if isinstance(value, list):
+        return value
+    return [part.strip() for part in (value or "").split(";") if part.strip()]
+
+def _parse_profile(record, line_number):
+    profile_id = record.get("id")
+    return {
+        "id": line_number if profile_id is None or profile_id == "" else profile_id,
+        "interests": _split(record.get("interests")),
+        "current_skills": _split(record.get("current_skills")),
+        "desired_skills": _split(record.get("desired_skills")),
+        "sdgs": [int(sdg_id) for sdg_id in _split(record.get("sdgs"))],
+        "count": int(record.get("count") or 1),
+    }
+
+def read_profiles(stream, input_format):
+    """Yield profiles one at a time from a CSV or JSONL stream"""
+    if input_format == "csv":
+        for line_number, record in enumerate(csv.DictReader(stream), start=1):
+            yield _parse_profile(record, line_number)
+    else:
+        for line_number, line in enumerate(stream, start=1):
+            if line.strip():
+                yield _parse_profile(json.loads(line), line_number)
+
+def _init_worker(top_k, api_key, catalog_path=None):
+    if catalog_path:
+        career_catalog = load_catalog(catalog_path)
+        _worker["engine"] = career_catalog.engine
+        _worker["sdgs"] = career_catalog.sdgs
+    else:
+        _worker["engine"] = scoring.default_engine()
+        _worker["sdgs"] = catalog.load_sdgs()
+    _worker["top_k"] = top_k
+    _worker["client"] = llm.create_client(api_key) if api_key else None
+
+def _match_chunk(profiles):
+    engine = _worker["engine"]
+    client = _worker["client"]
+    results = []
+    for profile in profiles:
+        matches = engine.top_matches(
+            profile["interests"],
+            profile["current_skills"],
+            profile["desired_skills"],
+            profile["sdgs"],
+            limit=_worker["top_k"]
+        )
+        explanation = None
+        if client is not None and matches:
+            explanation = llm.generate_career_explanation(
+                client, matches[0], profile["interests"], profile["current_skills"],
+                profile["desired_skills"], profile["sdgs"], sdgs=_worker["sdgs"]
+            )
+        results.append({
+            "profile_id": profile["id"],
+            "count": profile["count"],
+            "matches": [
+                {
+                    "career_id": match["id"],
+                    "title": match["title"],
+                    "score": match["score"],
+                    "match_details": match["match_details"],
+                }
+                for match in matches
+            ],
+            "explanation": explanation,
+        })
+    return results
+
+class _ResultWriter:
+    def __init__(self, stream, output_format):
+        self.stream = stream
+        self.output_format = output_format
+        self.students = 0
+        if output_format == "csv":
+            self.csv = csv.DictWriter(stream, fieldnames=CSV_OUTPUT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, result):
+        self.students += result["count"]
+        if self.output_format != "csv":
+            self.stream.write(json.dumps(result) + "\n")
+            return
+        for rank, match in enumerate(result["matches"], start=1):
+            self.csv.writerow({
+                "profile_id": result["profile_id"],
+                "count": result["count"],
+                "rank": rank,
+                "career_id": match["career_id"],
+                "title": match["title"],
+                "score": match["score"],
+                "explanation": result["explanation"] if rank == 1 else None,
+            })
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def run_batch(profiles, writer, workers=None, chunk_size=500, top_k=6, api_key=None, progress=None,
+              catalog_path=None):
+    """Score profiles in chunks across a process pool, writing results in input order.
+
+    At most two chunks per worker are in flight at once, so memory does not
+    grow with the input. Profiles are matched against the catalog at
+    `catalog_path` when given, else the built-in one. Returns the number of
+    profiles written.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+    written = 0
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(top_k, api_key, catalog_path)
+    ) as executor:
+        pending = collections.deque()
+
+        def drain_oldest():
+            nonlocal written
+            for result in pending.popleft().result():
+                writer.write(result)
+                written += 1
+            if progress is not None:
+                progress(written)
+
+        for chunk in _chunks(profiles, chunk_size):
+            if len(pending) >= max_in_flight:
+                drain_oldest()
+            pending.append(executor.submit(_match_chunk, chunk))
+        while pending:
+            drain_oldest()
+    return written
+
+def _detect_format(path, explicit):
+    if explicit:
+        return explicit
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Match a cohort of student profiles to careers.")
+    parser.add_argument("input", help="CSV or JSONL file of profiles, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"))
+    parser.add_argument("--output-format", choices=("csv", "jsonl"))
+    parser.add_argument("--top-k", type=int, default=6, help="matches per profile (default: 6)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="profiles per task (default: 500)")
+    parser.add_argument("--skip-llm", action="store_true", help="do not generate AI explanations")
+    parser.add_argument("--catalog", help="catalog file or directory to match against (default: built-in)")
+    args = parser.parse_args(argv)
+
+    if args.catalog:
+        # Fail on a bad catalog before starting any workers
+        try:
+            load_catalog(args.catalog)
+        except CatalogError as e:
+            parser.error(str(e))
+
+    api_key = None
+    if not args.skip_llm:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            parser.error("OPENAI_API_KEY is not set; pass --skip-llm to score without explanations")
+
+    input_format = _detect_format(args.input, args.input_format)
+    output_format = _detect_format(args.output, args.output_format)
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+
+    started = time.perf_counter()
+    last_report = started
+
+    def report(done):
+        nonlocal last_report
+        now = time.perf_counter()
+        if now - last_report >= 1:
+            last_report = now
+            print(f"{done} profiles, {done / (now - started):.0f} profiles/sec", file=sys.stderr)
+
+    writer = _ResultWriter(target, output_format)
+    try:
+        total = run_batch(
+            read_profiles(source, input_format),
+            writer,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            top_k=args.top_k,
+            api_key=api_key,
+            progress=report,
+            catalog_path=args.catalog
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Matched {total} profiles ({writer.students} students) in {elapsed:.2f}s "
+        f"({total / elapsed:.0f} profiles/sec)",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,264 @@
+"""Scoring-engine benchmarks over synthetic catalogs.
+
+Catalogs from the built-in 28 careers up to a million are generated in the
+shape of ``load_career_data()``. Each size is timed for every way the index
+gets built (the dict-based engine, a :class:`Catalog` over career records
+as the app loads it, and compiling and memory-mapping a compiled catalog),
+then for dense scoring, top-k selection, pruned top-k and result
+materialization on the app's engine, with peak memory recorded per size::
+
+    python -m lucidus.bench -o bench.json --sizes 28,1000,10000,100000,1000000
+    python -m lucidus.bench -o new.json --compare bench.json
+
+Results are JSON, so runs on different versions can be compared with
+``--compare``.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from lucidus import catalog, compiled, scoring
+from lucidus.catalog_source import Catalog
+
+DEFAULT_SIZES = (28, 1_000, 10_000, 100_000, 1_000_000)
+RESULT_FORMAT = 1
+
+def _taxonomy(categories):
+    return [item for items in categories.values() for item in items]
+
+class _Distribution:
+    """Attribute frequencies of the built-in catalog, smoothed over the whole taxonomy"""
+
+    def __init__(self, careers, vocabulary, field):
+        counts = {item: 1 for item in vocabulary}
+        for career in careers:
+            for item in career[field]:
+                counts[item] = counts.get(item, 0) + 1
+        self.items = list(counts)
+        self.weights = list(counts.values())
+
+    def draw(self, rng, k):
+        return rng.choices(self.items, weights=self.weights, k=k)
+
+def synthetic_catalog(size, seed=0, keep=0.6):
+    """`size` careers shaped like load_career_data(), with realistic attribute mixes.
+
+    Each career starts from a random built-in career, keeps each of its
+    attributes with probability `keep` and replaces the rest with draws
+    weighted by how often attributes appear in the built-in catalog, so
+    attribute counts and co-occurrence stay close to the real data. With
+    ``size=28`` the built-in catalog itself is returned.
+    """
+    careers = catalog.load_career_data()
+    if size == len(careers):
+        return careers
+    rng = random.Random(seed)
+    distributions = {
+        "interests": _Distribution(careers, _taxonomy(catalog.load_interest_categories()), "interests"),
+        "skills": _Distribution(careers, _taxonomy(catalog.load_skill_categories()), "skills"),
+        "sdgs": _Distribution(careers, [sdg["id"] for sdg in catalog.load_sdgs()], "sdgs"),
+    }
+    synthetic = []
+    for career_id in range(1, size + 1):
+        template = careers[rng.randrange(len(careers))]
+        career = {
+            "id": career_id,
+            "title": f"{template['title']} {career_id}",
+            "description": template["description"],
+        }
+        for field, distribution in distributions.items():
+            values = [value for value in template[field] if rng.random() < keep]
+            while len(values) < len(template[field]):
+                for value in distribution.draw(rng, len(template[field]) - len(values)):
+                    if value not in values:
+                        values.append(value)
+            career[field] = values
+        synthetic.append(career)
+    return synthetic
+
+def synthetic_profiles(count, seed=0):
+    """Wizard-shaped profiles: 3 interests, 3 current and 3 desired skills and 1-3 SDGs"""
+    rng = random.Random(seed)
+    interests = _taxonomy(catalog.load_interest_categories())
+    skills = _taxonomy(catalog.load_skill_categories())
+    sdg_ids = [sdg["id"] for sdg in catalog.load_sdgs()]
+    return [
+        (
+            rng.sample(interests, 3),
+            rng.sample(skills, 3),
+            rng.sample(skills, 3),
+            rng.sample(sdg_ids, rng.randint(1, 3)),
+        )
+        for _ in range(count)
+    ]
+
+def _timings(samples):
+    """Per-call statistics in microseconds"""
+    ordered = sorted(samples)
+    return {
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+def _timed(build):
+    """``(value, timings)`` of build(), with its seconds and peak traced memory"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    value = build()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, {"seconds": seconds, "peak_bytes": peak}
+
+def bench_size(size, queries=200, limit=6, seed=0):
+    """Benchmark one catalog size; returns a JSON-ready dict.
+
+    Queries run on the engine of a Catalog built from the careers, which is
+    what the app serves unless it is given a compiled catalog.
+    """
+    started = time.perf_counter()
+    careers = synthetic_catalog(size, seed)
+    generate_seconds = time.perf_counter() - started
+
+    builds = {}
+    _, builds["engine"] = _timed(lambda: scoring.CareerScoringEngine(careers))
+    career_catalog, builds["catalog"] = _timed(lambda: Catalog(
+        careers, catalog.load_interest_categories(), catalog.load_skill_categories(), catalog.load_sdgs(), "bench"
+    ))
+    with tempfile.TemporaryDirectory(prefix="lucidus-bench-") as directory:
+        path = os.path.join(directory, "catalog.compiled")
+        _, builds["compile"] = _timed(lambda: compiled.compile_catalog(career_catalog, path))
+        # Mapped pages are not traced, so peak_bytes only covers what opening allocates
+        _, builds["open_compiled"] = _timed(lambda: compiled.open_compiled(path))
+    engine = career_catalog.engine
+
+    profiles = synthetic_profiles(queries, seed + 1)
+    phases = {phase: [] for phase in ("score", "select_top", "top_rows", "materialize", "match_careers")}
+    for profile in profiles:
+        # Dense path: score every career, then select among those with score > 0
+        started = time.perf_counter()
+        scores = engine.score(*profile)
+        scored = time.perf_counter()
+        rows = np.flatnonzero(scores > 0).astype(np.int32)
+        engine._select_top(rows, scores[rows], limit)
+        selected = time.perf_counter()
+        phases["score"].append(scored - started)
+        phases["select_top"].append(selected - scored)
+
+        # Pruned path used by the app, split into ranking and building the result dicts
+        started = time.perf_counter()
+        rows, _ = engine.top_rows(*profile, limit=limit)
+        ranked = time.perf_counter()
+        for row in rows:
+            career = dict(engine.careers[row])
+            career["match_details"] = engine.match_details(row, *profile)
+        materialized = time.perf_counter()
+        phases["top_rows"].append(ranked - started)
+        phases["materialize"].append(materialized - ranked)
+
+        started = time.perf_counter()
+        engine.top_matches(*profile, limit=limit)
+        phases["match_careers"].append(time.perf_counter() - started)
+
+    result = {
+        "careers": size,
+        "queries": queries,
+        "limit": limit,
+        "generate_seconds": generate_seconds,
+        "build_seconds": builds["catalog"]["seconds"],
+        "build_peak_bytes": builds["catalog"]["peak_bytes"],
+        "builds": builds,
+        "incidence_bytes": engine.incidence.nbytes,
+        **{phase: _timings(samples) for phase, samples in phases.items()},
+    }
+
+    tracemalloc.start()
+    for profile in profiles[:20]:
+        engine.top_matches(*profile, limit=limit)
+    _, result["query_peak_bytes"] = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Process-wide high-water mark so far, including the catalog dicts themselves
+    result["max_rss_bytes"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return result
+
+def run(sizes=DEFAULT_SIZES, queries=200, limit=6, seed=0, progress=None):
+    results = []
+    for size in sizes:
+        results.append(bench_size(size, queries, limit, seed))
+        if progress is not None:
+            progress(results[-1])
+    return {
+        "format": RESULT_FORMAT,
+        "created_at": time.time(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+def compare(baseline, current, metric="p50_us"):
+    """Lines comparing `metric` of each timed phase between two result files, by catalog size"""
+    previous = {result["careers"]: result for result in baseline["results"]}
+    lines = []
+    for result in current["results"]:
+        before = previous.get(result["careers"])
+        if before is None:
+            continue
+        for phase in ("score", "select_top", "top_rows", "materialize", "match_careers"):
+            if phase in before:
+                ratio = result[phase][metric] / max(before[phase][metric], 1e-9)
+                lines.append(
+                    f"{result['careers']:>9} {phase:<14} {before[phase][metric]:>11.1f} -> "
+                    f"{result[phase][metric]:>11.1f} us  ({ratio:.2f}x)"
+                )
+    return lines
+
+def _report(result):
+    print(
+        f"{result['careers']:>9} careers: build {result['build_seconds'] * 1e3:.0f} ms "
+        f"(dict engine {result['builds']['engine']['seconds'] * 1e3:.0f} ms, "
+        f"open compiled {result['builds']['open_compiled']['seconds'] * 1e3:.1f} ms), "
+        f"score p50 {result['score']['p50_us']:.0f} us, top_rows p50 {result['top_rows']['p50_us']:.0f} us, "
+        f"match_careers p50 {result['match_careers']['p50_us']:.0f} us, "
+        f"build peak {result['build_peak_bytes'] / 2**20:.1f} MiB",
+        file=sys.stderr
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scoring engine on synthetic catalogs.")
+    parser.add_argument("-o", "--output", help="write results as JSON to this path")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated catalog sizes (default: %(default)s)")
+    parser.add_argument("--queries", type=int, default=200, help="profiles timed per size (default: 200)")
+    parser.add_argument("--limit", type=int, default=6, help="matches per profile (default: 6)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", help="earlier results JSON to compare p50 timings against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    results = run(sizes, args.queries, args.limit, args.seed, progress=_report)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare(baseline, results)), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Caches shared across sessions for LLM-generated text."""
+import collections
+import json
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+def make_key(*parts):
+    """Stable string key from JSON-serializable parts"""
+    return json.dumps(parts, separators=(",", ":"), ensure_ascii=False)
+
+def canonical_profile(interests, current_skills, desired_skills, selected_sdgs):
+    """Order-independent form of a profile, suitable as part of a cache key"""
+    return (
+        tuple(sorted(interests)),
+        tuple(sorted(current_skills)),
+        tuple(sorted(desired_skills)),
+        tuple(sorted(selected_sdgs)),
+    )
+
+class LRUCache:
+    """Thread-safe in-memory LRU cache bounded by entry count and total value size.
+
+    Sizes are estimated with `sizeof` (``sys.getsizeof`` by default).
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=16 * 1024 * 1024, sizeof=sys.getsizeof):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self.nbytes > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def __sizeof__(self):
+        # Includes the cached values, so sys.getsizeof() estimates the whole cache
+        with self._lock:
+            return (
+                object.__sizeof__(self) + sys.getsizeof(self._entries) + self.nbytes
+                + sum(sys.getsizeof(key) for key in self._entries)
+            )
+
+class PersistentCache:
+    """SQLite-backed text cache shared by every session and surviving restarts.
+
+    Values are stored zlib-compressed. Entries older than `ttl` seconds are
+    treated as missing, and once the stored values exceed `max_bytes` the
+    least recently used entries are evicted. Several processes may share the
+    same file; within a process one connection is shared behind a lock.
+    """
+
+    def __init__(self, path, ttl=30 * 24 * 3600, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self.hits += 1
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def set(self, key, value):
+        now = time.time()
+        blob = zlib.compress(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM entries ORDER BY accessed_at"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            total -= size
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,289 @@
+"""Career catalogs loaded from JSON, CSV or Parquet files, with hot reload.
+
+A catalog path is either a single JSON file holding ``careers`` and,
+optionally, ``interest_categories``, ``skill_categories`` and ``sdgs``, or
+a directory with one file per table, named ``careers``, ``interests``,
+``skills`` and ``sdgs`` with a ``.json``, ``.csv`` or ``.parquet``
+extension. Tables that are not given fall back to the built-in ones.
+
+In CSV and Parquet files careers have the columns ``id``, ``title``,
+``description``, ``interests``, ``skills`` and ``sdgs``, where list values
+are separated by ``;``. Taxonomies have ``category`` and ``name`` columns,
+and SDGs have ``id`` and ``name``.
+
+A directory written by ``python -m lucidus.compiled`` is memory-mapped
+instead of parsed; see :mod:`lucidus.compiled`.
+"""
+import csv
+import hashlib
+import io
+import json
+import logging
+import os
+import threading
+import time
+
+from lucidus import catalog, records, scoring
+
+logger = logging.getLogger(__name__)
+
+TABLES = ("careers", "interests", "skills", "sdgs")
+FORMATS = (".json", ".csv", ".parquet")
+COMPILED_MANIFEST = "manifest.json"
+
+class CatalogError(ValueError):
+    """A catalog file is missing, unreadable or fails schema validation"""
+
+class Catalog:
+    """One version of the career catalog and the structures derived from it.
+
+    Careers given as dicts are stored as :class:`lucidus.records.Career`
+    records over the catalog's taxonomy. The engine's incidence columns are
+    the taxonomy ids, so a :class:`lucidus.records.Profile` over ``taxonomy``
+    can be scored without looking labels up.
+
+    Derived structures are built once, when the catalog is created, and
+    belong to this version: a reload produces a new Catalog, so anything
+    keyed by ``version`` is invalidated without clearing unrelated caches.
+    """
+
+    def __init__(self, careers, interest_categories, skill_categories, sdgs, version, engine=None,
+                 career_by_id=None, taxonomy=None):
+        self.interest_categories = interest_categories
+        self.skill_categories = skill_categories
+        self.sdgs = sdgs
+        self.version = version
+        self.taxonomy = taxonomy or records.Taxonomy(interest_categories, skill_categories, sdgs)
+        if engine is None:
+            careers = [records.Career.from_dict(career, self.taxonomy) for career in careers]
+            engine = scoring.CareerScoringEngine.from_records(careers, self.taxonomy)
+        self.careers = careers
+        self.career_by_id = career_by_id if career_by_id is not None else {career["id"]: career for career in careers}
+        self.sdg_names = {sdg["id"]: sdg["name"] for sdg in sdgs}
+        self.engine = engine
+
+    @classmethod
+    def builtin(cls):
+        """The catalog shipped in :mod:`lucidus.catalog`, held to the same schema as loaded ones"""
+        tables = (
+            catalog.load_career_data(), catalog.load_interest_categories(), catalog.load_skill_categories(),
+            catalog.load_sdgs()
+        )
+        validate(*tables)
+        return cls(*tables, "builtin")
+
+def validate(careers, interest_categories, skill_categories, sdgs):
+    """Raise CatalogError listing every schema problem found"""
+    problems = []
+    interests = {name for names in interest_categories.values() for name in names}
+    skills = {name for names in skill_categories.values() for name in names}
+    sdg_ids = [sdg.get("id") for sdg in sdgs]
+    if len(set(sdg_ids)) != len(sdg_ids):
+        problems.append("duplicate SDG ids")
+    if any(not isinstance(sdg_id, int) for sdg_id in sdg_ids) or any(not sdg.get("name") for sdg in sdgs):
+        problems.append("every SDG needs an integer id and a name")
+
+    seen_ids = set()
+    for position, career in enumerate(careers, start=1):
+        label = f"career {career.get('id', f'#{position}')}"
+        missing = [field for field in ("id", "title", "description", "interests", "skills", "sdgs")
+                   if field not in career]
+        if missing:
+            problems.append(f"{label}: missing {', '.join(missing)}")
+            continue
+        if career["id"] in seen_ids:
+            problems.append(f"{label}: duplicate id")
+        seen_ids.add(career["id"])
+        if not career["title"]:
+            problems.append(f"{label}: empty title")
+        for interest in career["interests"]:
+            if interest not in interests:
+                problems.append(f"{label}: unknown interest {interest!r}")
+        for skill in career["skills"]:
+            if skill not in skills:
+                problems.append(f"{label}: unknown skill {skill!r}")
+        for sdg_id in career["sdgs"]:
+            if sdg_id not in sdg_ids:
+                problems.append(f"{label}: invalid SDG id {sdg_id!r}")
+    if not careers:
+        problems.append("no careers")
+    if problems:
+        shown = problems[:20]
+        more = f"\n  ... and {len(problems) - len(shown)} more" if len(problems) > len(shown) else ""
+        raise CatalogError("Invalid catalog:\n  " + "\n  ".join(shown) + more)
+
+def _split(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(";") if part.strip()]
+    return list(value)
+
+def _rows(data, extension):
+    """Records of a CSV or Parquet table, or the parsed value of a JSON one"""
+    if extension == ".json":
+        return json.loads(data)
+    if extension == ".csv":
+        return list(csv.DictReader(io.StringIO(data.decode("utf-8-sig"))))
+    # Imported lazily; Parquet support needs pandas with pyarrow
+    import pandas as pd
+    frame = pd.read_parquet(io.BytesIO(data))
+    return [{key: (value.tolist() if hasattr(value, "tolist") else value) for key, value in row.items()}
+            for row in frame.to_dict("records")]
+
+def _parse_careers(rows):
+    careers = []
+    for row in rows:
+        career = dict(row)
+        for field in ("interests", "skills", "sdgs"):
+            if field in career:
+                career[field] = _split(career[field])
+        try:
+            if "id" in career:
+                career["id"] = int(career["id"])
+            if "sdgs" in career:
+                career["sdgs"] = [int(sdg_id) for sdg_id in career["sdgs"]]
+        except (TypeError, ValueError) as e:
+            raise CatalogError(f"career {career.get('id')!r}: ids must be integers ({e})") from None
+        careers.append(career)
+    return careers
+
+def _parse_taxonomy(rows):
+    if isinstance(rows, dict):
+        return {category: list(names) for category, names in rows.items()}
+    taxonomy = {}
+    for row in rows:
+        taxonomy.setdefault(row["category"], []).append(row["name"])
+    return taxonomy
+
+def _parse_sdgs(rows):
+    try:
+        return [{"id": int(row["id"]), "name": row["name"]} for row in rows]
+    except (KeyError, TypeError, ValueError) as e:
+        raise CatalogError(f"SDGs need integer id and name columns ({e})") from None
+
+def _table_files(path):
+    """Map of table name to file for a catalog path"""
+    if os.path.isfile(os.path.join(path, COMPILED_MANIFEST)):
+        # Only the manifest is read and hashed; it changes with every recompile
+        return {"compiled": os.path.join(path, COMPILED_MANIFEST)}
+    if os.path.isdir(path):
+        files = {}
+        for table in TABLES:
+            for extension in FORMATS:
+                candidate = os.path.join(path, table + extension)
+                if os.path.exists(candidate):
+                    files[table] = candidate
+                    break
+        if "careers" not in files:
+            raise CatalogError(f"No careers.json, careers.csv or careers.parquet in {path}")
+        return files
+    if not os.path.exists(path):
+        raise CatalogError(f"Catalog {path} does not exist")
+    return {"careers": path}
+
+def _signature(files):
+    stats = []
+    for table, file in sorted(files.items()):
+        stat = os.stat(file)
+        stats.append((table, file, stat.st_mtime_ns, stat.st_size))
+    return tuple(stats)
+
+def _read(files):
+    """Raw bytes of every table file and their combined content hash"""
+    contents = {}
+    digest = hashlib.sha256()
+    for table, file in sorted(files.items()):
+        with open(file, "rb") as f:
+            contents[table] = f.read()
+        digest.update(table.encode("utf-8") + b"\0" + contents[table] + b"\0")
+    return contents, digest.hexdigest()[:16]
+
+def _build(files, contents, version):
+    if "compiled" in files:
+        # Imported here because lucidus.compiled builds on this module
+        from lucidus import compiled
+        return compiled.open_compiled(os.path.dirname(files["compiled"]), version)
+    tables = {}
+    try:
+        for table, data in contents.items():
+            tables[table] = _rows(data, os.path.splitext(files[table])[1].lower())
+    except (ValueError, KeyError, ImportError, OSError) as e:
+        raise CatalogError(f"Could not read catalog table {table}: {e}") from None
+    careers = tables["careers"]
+    if isinstance(careers, dict):
+        # A single JSON bundle holding every table
+        tables = {
+            "careers": careers.get("careers", []),
+            "interests": careers.get("interest_categories"),
+            "skills": careers.get("skill_categories"),
+            "sdgs": careers.get("sdgs"),
+        }
+    try:
+        parsed = (
+            _parse_careers(tables["careers"]),
+            _parse_taxonomy(tables["interests"]) if tables.get("interests") is not None
+            else catalog.load_interest_categories(),
+            _parse_taxonomy(tables["skills"]) if tables.get("skills") is not None
+            else catalog.load_skill_categories(),
+            _parse_sdgs(tables["sdgs"]) if tables.get("sdgs") is not None else catalog.load_sdgs(),
+        )
+    except (KeyError, TypeError, AttributeError) as e:
+        raise CatalogError(f"Malformed catalog table: {e!r}") from None
+    validate(*parsed)
+    return Catalog(*parsed, version)
+
+def load_catalog(path):
+    """Load and validate the catalog at `path`; raises CatalogError"""
+    files = _table_files(path)
+    contents, version = _read(files)
+    return _build(files, contents, version)
+
+class CatalogSource:
+    """The current catalog at `path`, reloaded when its files change.
+
+    get() stats the files at most every `check_interval` seconds. A changed
+    mtime or size triggers a read, but the catalog is only rebuilt when the
+    content hash differs too. A reload that fails validation is logged and
+    the previous catalog stays in service; the first load raises instead.
+    """
+
+    def __init__(self, path, check_interval=2.0, clock=time.monotonic):
+        self.path = path
+        self.check_interval = check_interval
+        self.clock = clock
+        self.reloads = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+        files = _table_files(path)
+        self._signature = _signature(files)
+        contents, version = _read(files)
+        self._catalog = _build(files, contents, version)
+        self._checked = clock()
+
+    def get(self):
+        if self.clock() - self._checked < self.check_interval:
+            return self._catalog
+        with self._lock:
+            if self.clock() - self._checked >= self.check_interval:
+                self._refresh()
+                self._checked = self.clock()
+        return self._catalog
+
+    def _refresh(self):
+        try:
+            files = _table_files(self.path)
+            signature = _signature(files)
+            if signature == self._signature:
+                return
+            contents, version = _read(files)
+            self._signature = signature
+            if version == self._catalog.version:
+                return
+            self._catalog = _build(files, contents, version)
+            self.reloads += 1
+            self.last_error = None
+            logger.info("Reloaded catalog %s (version %s)", self.path, version)
+        except (CatalogError, OSError) as e:
+            self.last_error = str(e)
+            logger.warning("Keeping catalog version %s: %s", self._catalog.version, e)
@@ -0,0 +1,231 @@
+"""Compiled catalogs: a directory of ``.npy`` arrays that processes memory-map.
+
+Compiling writes the catalog as flat arrays, namely the incidence matrix,
+the posting lists, every career's attribute columns in their original
+order, and one UTF-8 string table holding titles and descriptions. A small
+``manifest.json`` holds the attribute vocabularies, the taxonomies and the
+SDGs. Opening it maps every array read-only, so app and batch worker
+processes share one page-cache copy, start without parsing anything and
+score directly on the mapped arrays. Career dicts are only built for the
+rows that are displayed::
+
+    python -m lucidus.compiled catalog/ -o catalog.compiled
+    LUCIDUS_CATALOG=catalog.compiled streamlit run app.py
+
+Any catalog path accepted by :func:`lucidus.catalog_source.load_catalog`
+can be compiled, and a compiled directory can be given wherever a catalog
+path is, so CatalogSource picks up a recompiled artifact like a changed
+file. Only the standard career fields are compiled.
+"""
+import argparse
+import collections.abc
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from lucidus import records, scoring
+from lucidus.catalog_source import COMPILED_MANIFEST as MANIFEST
+from lucidus.catalog_source import Catalog, CatalogError, load_catalog
+
+COMPILED_FORMAT = 1
+ARRAYS = (
+    "ids", "id_order", "text", "text_offsets", "attrs", "attr_offsets", "incidence", "postings", "posting_offsets",
+)
+
+def _offsets(lengths):
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+def _arrays(career_catalog):
+    engine = career_catalog.engine
+    careers = career_catalog.careers
+    ids = np.array([career["id"] for career in careers], dtype=np.int64)
+
+    # Title and description of row i are strings 2i and 2i + 1
+    encoded = [
+        text.encode("utf-8")
+        for career in careers
+        for text in (career["title"], career["description"])
+    ]
+    text = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    attrs = [
+        [engine._interest_column(i) for i in career["interests"]]
+        + [engine._skill_column(s) for s in career["skills"]]
+        + [engine._sdg_column(g) for g in career["sdgs"]]
+        for career in careers
+    ]
+    return {
+        "ids": ids,
+        "id_order": np.argsort(ids, kind="stable"),
+        "text": text,
+        "text_offsets": _offsets([len(item) for item in encoded]),
+        "attrs": np.fromiter((col for row in attrs for col in row), dtype=np.int32),
+        "attr_offsets": _offsets([len(row) for row in attrs]),
+        "incidence": np.ascontiguousarray(engine.incidence, dtype=np.uint8),
+        "postings": np.concatenate(engine.postings or [np.empty(0, dtype=np.int32)]).astype(np.int32),
+        "posting_offsets": _offsets([len(posting) for posting in engine.postings]),
+    }
+
+def compile_catalog(career_catalog, path):
+    """Write `career_catalog` as a compiled catalog directory at `path`, replacing any existing one.
+
+    The arrays are written to a temporary directory next to `path` and
+    swapped in, so readers never see a half-written catalog; processes
+    that already mapped the old files keep using them until they reload.
+    """
+    engine = career_catalog.engine
+    manifest = {
+        "format": COMPILED_FORMAT,
+        "version": career_catalog.version,
+        "careers": len(career_catalog.careers),
+        "interests": list(engine.interest_ids),
+        "skills": list(engine.skill_ids),
+        "sdg_ids": list(engine.sdg_ids),
+        "interest_categories": career_catalog.interest_categories,
+        "skill_categories": career_catalog.skill_categories,
+        "sdgs": career_catalog.sdgs,
+    }
+    parent = os.path.dirname(os.path.abspath(path))
+    staging = tempfile.mkdtemp(prefix=".compiling-", dir=parent)
+    try:
+        for name, array in _arrays(career_catalog).items():
+            np.save(os.path.join(staging, name + ".npy"), array, allow_pickle=False)
+        # Written last: a directory without a manifest is never opened
+        with open(os.path.join(staging, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f)
+        if os.path.exists(path):
+            retired = tempfile.mkdtemp(prefix=".retired-", dir=parent)
+            os.replace(path, os.path.join(retired, "catalog"))
+            os.replace(staging, path)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, path)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+class CompiledCareers(collections.abc.Sequence):
+    """Read-only sequence of career dicts, built on access from the mapped arrays"""
+
+    def __init__(self, arrays, labels, skill_offset, sdg_offset):
+        self._arrays = arrays
+        self._labels = labels
+        self._skill_offset = skill_offset
+        self._sdg_offset = sdg_offset
+
+    def __len__(self):
+        return len(self._arrays["ids"])
+
+    def _text(self, index):
+        offsets = self._arrays["text_offsets"]
+        return self._arrays["text"][offsets[index]:offsets[index + 1]].tobytes().decode("utf-8")
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[i] for i in range(*row.indices(len(self)))]
+        row = int(row)
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("career row out of range")
+        offsets = self._arrays["attr_offsets"]
+        columns = self._arrays["attrs"][offsets[row]:offsets[row + 1]].tolist()
+        return {
+            "id": int(self._arrays["ids"][row]),
+            "title": self._text(2 * row),
+            "description": self._text(2 * row + 1),
+            "interests": [self._labels[col] for col in columns if col < self._skill_offset],
+            "skills": [self._labels[col] for col in columns if self._skill_offset <= col < self._sdg_offset],
+            "sdgs": [self._labels[col] for col in columns if col >= self._sdg_offset],
+        }
+
+    def row_of(self, career_id):
+        """Row of the career with `career_id`, or None"""
+        if not isinstance(career_id, (int, np.integer)):
+            return None
+        ids, order = self._arrays["ids"], self._arrays["id_order"]
+        position = int(np.searchsorted(ids, career_id, sorter=order))
+        if position < len(ids) and ids[order[position]] == career_id:
+            return int(order[position])
+        return None
+
+class CompiledCareersById(collections.abc.Mapping):
+    """Career id to career dict lookup by binary search over the mapped ids"""
+
+    def __init__(self, careers):
+        self._careers = careers
+
+    def __getitem__(self, career_id):
+        row = self._careers.row_of(career_id)
+        if row is None:
+            raise KeyError(career_id)
+        return self._careers[row]
+
+    def __iter__(self):
+        return (int(career_id) for career_id in self._careers._arrays["ids"])
+
+    def __len__(self):
+        return len(self._careers)
+
+def open_compiled(path, version=None):
+    """Memory-map the compiled catalog at `path` as a Catalog; raises CatalogError"""
+    try:
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        raise CatalogError(f"Could not read {MANIFEST} of compiled catalog {path}: {e}") from None
+    if manifest.get("format") != COMPILED_FORMAT:
+        raise CatalogError(
+            f"Compiled catalog {path} has format {manifest.get('format')!r}, expected {COMPILED_FORMAT}; recompile it"
+        )
+    try:
+        arrays = {
+            name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r", allow_pickle=False)
+            for name in ARRAYS
+        }
+    except (OSError, ValueError) as e:
+        raise CatalogError(f"Could not map compiled catalog {path}: {e}") from None
+
+    interests, skills, sdg_ids = manifest["interests"], manifest["skills"], manifest["sdg_ids"]
+    skill_offset = len(interests)
+    sdg_offset = skill_offset + len(skills)
+    careers = CompiledCareers(arrays, interests + skills + sdg_ids, skill_offset, sdg_offset)
+    offsets = arrays["posting_offsets"].tolist()
+    postings = [arrays["postings"][start:end] for start, end in zip(offsets, offsets[1:])]
+    engine = scoring.CareerScoringEngine.from_arrays(
+        careers, interests, skills, sdg_ids, arrays["incidence"], postings
+    )
+    return Catalog(
+        careers, manifest["interest_categories"], manifest["skill_categories"], manifest["sdgs"],
+        version or manifest["version"], engine=engine, career_by_id=CompiledCareersById(careers),
+        taxonomy=records.Taxonomy.from_labels(interests, skills, sdg_ids)
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a career catalog into memory-mappable arrays.")
+    parser.add_argument("catalog", nargs="?", help="catalog file or directory to compile (default: built-in)")
+    parser.add_argument("-o", "--output", required=True, help="compiled catalog directory to write")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        career_catalog = load_catalog(args.catalog) if args.catalog else Catalog.builtin()
+    except CatalogError as e:
+        parser.error(str(e))
+    compile_catalog(career_catalog, args.output)
+    size = sum(os.path.getsize(os.path.join(args.output, name)) for name in os.listdir(args.output))
+    print(
+        f"Compiled {len(career_catalog.careers)} careers (version {career_catalog.version}) to {args.output}: "
+        f"{size / 2**20:.1f} MiB in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Offline stand-ins for the OpenAI client, for warm-up runs and tests."""
+import asyncio
+import hashlib
+import threading
+import time
+import types
+
+def _fake_text(messages, max_tokens):
+    prompt = messages[-1]["content"]
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+    subject = " ".join(prompt.split()[:12])
+    return f"[offline response {digest}, up to {max_tokens} tokens] {subject} ..."
+
+def _usage(messages, text):
+    prompt_tokens = sum(len(m["content"].split()) for m in messages)
+    completion_tokens = len(text.split())
+    return types.SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens
+    )
+
+def _stream_chunks(text, usage):
+    words = text.split(" ")
+    for i, word in enumerate(words):
+        delta = types.SimpleNamespace(content=word if i == len(words) - 1 else word + " ")
+        yield types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)], usage=None)
+    yield types.SimpleNamespace(choices=[], usage=usage)
+
+class _FakeCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def create(self, model, messages, max_tokens=None, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        text = _fake_text(messages, max_tokens)
+        usage = _usage(messages, text)
+        if stream:
+            return _stream_chunks(text, usage)
+        message = types.SimpleNamespace(role="assistant", content=text)
+        return types.SimpleNamespace(
+            model=model,
+            choices=[types.SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage
+        )
+
+class FakeOpenAI:
+    """Deterministic, network-free client exposing ``chat.completions.create``.
+
+    Responses are derived from the prompt, so the same request always gets
+    the same text. `latency` seconds are slept per call.
+    """
+
+    def __init__(self, latency=0.0):
+        self.chat = types.SimpleNamespace(completions=_FakeCompletions(latency))
+
+    @property
+    def calls(self):
+        return self.chat.completions.calls
+
+async def _astream_chunks(text, usage):
+    for chunk in _stream_chunks(text, usage):
+        yield chunk
+
+class _AsyncFakeCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+
+    async def create(self, model, messages, max_tokens=None, stream=False, **kwargs):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = _fake_text(messages, max_tokens)
+        usage = _usage(messages, text)
+        if stream:
+            return _astream_chunks(text, usage)
+        message = types.SimpleNamespace(role="assistant", content=text)
+        return types.SimpleNamespace(
+            model=model,
+            choices=[types.SimpleNamespace(index=0, message=message, finish_reason="stop")],
+            usage=usage
+        )
+
+class AsyncFakeOpenAI:
+    """Asyncio counterpart of FakeOpenAI, usable as an async context manager"""
+
+    def __init__(self, latency=0.0):
+        self.chat = types.SimpleNamespace(completions=_AsyncFakeCompletions(latency))
+
+    @property
+    def calls(self):
+        return self.chat.completions.calls
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
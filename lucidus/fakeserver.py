@@ -0,0 +1,201 @@
+"""A local stand-in for the OpenAI chat completions endpoint, for load tests.
+
+It answers ``POST /v1/chat/completions`` with the same deterministic text
+as :class:`lucidus.fakes.FakeOpenAI`, streamed as server-sent events when
+asked. Latency is log-normal and errors and rate limits are injected at
+configurable rates. Point the OpenAI SDK at it with ``OPENAI_BASE_URL``::
+
+    python -m lucidus.fakeserver --port 8900 --latency-median 1.5 --rate-limit-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8900/v1 streamlit run app.py
+
+``GET /stats`` returns request counts by call kind and response status.
+"""
+import argparse
+import collections
+import http.server
+import json
+import math
+import random
+import threading
+import time
+import uuid
+
+from lucidus import llm
+from lucidus.fakes import _fake_text
+
+class FakeServerConfig:
+    """Behaviour of the fake endpoint.
+
+    `latency_median` and `latency_sigma` give the log-normal delay before the
+    first byte; streamed responses then wait `token_interval` seconds between
+    chunks. A fraction `error_rate` of requests fail with 500 and
+    `rate_limit_rate` with 429 and a ``Retry-After`` of `retry_after` seconds.
+    """
+
+    def __init__(self, latency_median=0.5, latency_sigma=0.5, token_interval=0.02, error_rate=0.0,
+                 rate_limit_rate=0.0, retry_after=1.0, seed=None):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.token_interval = token_interval
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def latency(self):
+        if self.latency_median <= 0:
+            return 0.0
+        with self._lock:
+            return self.rng.lognormvariate(math.log(self.latency_median), self.latency_sigma)
+
+    def outcome(self):
+        """HTTP status for the next request: 200, 429 or 500"""
+        with self._lock:
+            roll = self.rng.random()
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 500
+        return 200
+
+def _call_kind(request):
+    return "detail" if request.get("max_tokens") == llm.DETAIL_MAX_TOKENS else "explanation"
+
+class FakeOpenAIServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, config):
+        super().__init__(address, _Handler)
+        self.config = config
+        self.stats = collections.Counter()
+        self._stats_lock = threading.Lock()
+
+    def count(self, kind, status):
+        with self._stats_lock:
+            self.stats[f"{kind}:{status}"] += 1
+            self.stats[f"{kind}:total"] += 1
+
+    def snapshot(self):
+        with self._stats_lock:
+            return dict(self.stats)
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, body, headers=()):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.split("?")[0] == "/stats":
+            self._send_json(200, self.server.snapshot())
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.split("?")[0].rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+        config = self.server.config
+        kind = _call_kind(request)
+        time.sleep(config.latency())
+        status = config.outcome()
+        self.server.count(kind, status)
+        if status == 429:
+            self._send_json(429, {"error": {"message": "Rate limit reached (injected)", "type": "requests",
+                                            "code": "rate_limit_exceeded"}},
+                            headers=[("Retry-After", str(config.retry_after))])
+            return
+        if status == 500:
+            self._send_json(500, {"error": {"message": "Internal error (injected)", "type": "server_error"}})
+            return
+
+        messages = request.get("messages", [])
+        text = _fake_text(messages, request.get("max_tokens"))
+        prompt_tokens = sum(len((m.get("content") or "").split()) for m in messages)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": len(text.split()),
+                 "total_tokens": prompt_tokens + len(text.split())}
+        base = {"id": f"chatcmpl-{uuid.uuid4().hex[:12]}", "created": int(time.time()),
+                "model": request.get("model", llm.MODEL)}
+        if not request.get("stream"):
+            self._send_json(200, {
+                **base, "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def event(payload):
+            data = f"data: {payload}\n\n".encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+            self.wfile.flush()
+
+        words = text.split(" ")
+        for i, word in enumerate(words):
+            delta = {"content": word if i == len(words) - 1 else word + " "}
+            event(json.dumps({**base, "object": "chat.completion.chunk",
+                              "choices": [{"index": 0, "delta": delta, "finish_reason": None}]}))
+            if config.token_interval:
+                time.sleep(config.token_interval)
+        event(json.dumps({**base, "object": "chat.completion.chunk",
+                          "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            event(json.dumps({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}))
+        event("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+def serve(config=None, port=0, host="127.0.0.1"):
+    """Start a fake server on a daemon thread; returns it (see ``base_url`` and ``snapshot()``)"""
+    server = FakeOpenAIServer((host, port), config or FakeServerConfig())
+    threading.Thread(target=server.serve_forever, name="lucidus-fake-openai", daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake OpenAI chat completions endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-median", type=float, default=0.5, help="median seconds to first byte")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="log-normal spread (default: 0.5)")
+    parser.add_argument("--token-interval", type=float, default=0.02, help="seconds between streamed chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests failing with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of requests failing with 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    config = FakeServerConfig(
+        args.latency_median, args.latency_sigma, args.token_interval, args.error_rate,
+        args.rate_limit_rate, args.retry_after, args.seed
+    )
+    server = FakeOpenAIServer((args.host, args.port), config)
+    print(f"Fake OpenAI endpoint at {server.base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
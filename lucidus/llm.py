@@ -0,0 +1,341 @@
+"""OpenAI helpers for career explanations and detailed career information."""
+import concurrent.futures
+import hashlib
+import logging
+import queue
+import threading
+import typing
+
+from lucidus import catalog, metrics, tracing
+from lucidus.cache import canonical_profile, make_key
+
+logger = logging.getLogger(__name__)
+
+MODEL = "gpt-4o-mini"
+EXPLANATION_MAX_TOKENS = 200
+DETAIL_MAX_TOKENS = 700
+
+# Bump when a prompt changes so cached responses from the old prompt are not reused
+EXPLANATION_PROMPT_VERSION = 1
+DETAIL_PROMPT_VERSION = 1
+
+EXPLANATION_FALLBACK = "Unable to generate explanation at this time."
+DETAIL_FALLBACK = "Unable to retrieve detailed information at this time."
+
+def create_client(api_key, **kwargs):
+    # Imported lazily so the core stays cheap to import
+    import openai
+    return openai.OpenAI(api_key=api_key, **kwargs)
+
+# Calls with a deadline run here, so they can finish and fill the cache after the caller gives up
+_background = None
+_background_lock = threading.Lock()
+
+def _background_executor():
+    global _background
+    with _background_lock:
+        if _background is None:
+            _background = concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix="lucidus-llm")
+        return _background
+
+def _join_names(names):
+    names = list(names)
+    if len(names) <= 1:
+        return "".join(names)
+    return ", ".join(names[:-1]) + " and " + names[-1]
+
+def local_explanation(career, sdgs=None):
+    """Explanation built locally from a scored career's match_details, for when the LLM is too slow"""
+    details = career["match_details"]
+    sdg_names = catalog.get_sdg_names(sdgs if sdgs is not None else catalog.load_sdgs(), details["sdg_matches"])
+    current = details["skill_matches"]["current"]
+    desired = details["skill_matches"]["desired"]
+    sentences = []
+    if details["interest_matches"]:
+        sentences.append(f"{career['title']} builds on your interest in {_join_names(details['interest_matches'])}.")
+    if current and desired:
+        sentences.append(
+            f"It puts your {_join_names(current)} skills to work while helping you develop {_join_names(desired)}."
+        )
+    elif current:
+        sentences.append(f"It puts your {_join_names(current)} skills to work.")
+    elif desired:
+        sentences.append(f"It is a chance to develop {_join_names(desired)}.")
+    if sdg_names:
+        sentences.append(f"It also contributes to {_join_names(sdg_names)}.")
+    if not sentences:
+        sentences.append(f"{career['title']} fits your overall profile.")
+    return " ".join(sentences)
+
+def local_career_info(career, sdgs=None):
+    """Career overview built locally from the catalog, for when the LLM is too slow"""
+    sdg_names = catalog.get_sdg_names(sdgs if sdgs is not None else catalog.load_sdgs(), career["sdgs"])
+    return "\n".join([
+        "**Related school subjects**",
+        *[f"- {interest}" for interest in career["interests"]],
+        "",
+        "**Key skills**",
+        *[f"- {skill}" for skill in career["skills"]],
+        "",
+        "**Sustainable Development Goals**",
+        *[f"- {name}" for name in sdg_names],
+    ])
+
+def _report_error(message, on_error):
+    logger.warning(message)
+    if on_error is not None:
+        on_error(message)
+
+def career_digest(career):
+    """Short hash of the career text the explanation prompt is built from"""
+    text = f"{career['title']}\0{career['description']}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def explanation_cache_key(career, user_interests, current_skills, desired_skills, selected_sdgs, model=MODEL):
+    """Key of a career's explanation for a profile; editing the career in the catalog changes it"""
+    profile = canonical_profile(user_interests, current_skills, desired_skills, selected_sdgs)
+    return make_key("explanation", career["id"], career_digest(career), profile, EXPLANATION_PROMPT_VERSION, model)
+
+def explanation_messages(career, user_interests, current_skills, desired_skills, selected_sdgs, sdgs=None):
+    """Chat messages asking why a career matches the user's profile"""
+    # Get SDG names for selected SDGs
+    sdg_names = catalog.get_sdg_names(sdgs if sdgs is not None else catalog.load_sdgs(), selected_sdgs)
+
+    # Create prompt
+    prompt = f"""
+    As a career advisor, explain why the career '{career['title']}' ({career['description']}) 
+    is a good match for someone with the following profile:
+    
+    Interests: {', '.join(user_interests)}
+    Current Skills: {', '.join(current_skills)}
+    Skills they want to develop: {', '.join(desired_skills)}
+    Values (SDGs they care about): {', '.join(sdg_names)}
+    
+    Identify specific connections between their profile and this career. 
+    Keep your response to 3-4 sentences and focus on how this career aligns with their interests, 
+    leverages their current skills, helps them develop their desired skills, and supports their values.
+    """
+    return [
+        {"role": "system", "content": "You are a career advisor who provides concise, personalized explanations."},
+        {"role": "user", "content": prompt}
+    ]
+
+def detail_cache_key(career_title, model=MODEL):
+    return make_key("detail", career_title, DETAIL_PROMPT_VERSION, model)
+
+def detail_messages(career_title):
+    """Chat messages asking for the educational path into a career"""
+    prompt = f"""
+    Provide detailed educational and career path information for someone interested in becoming a {career_title}. 
+    Include the following sections:
+    
+    1. School Subjects: List 5-7 specific high school or secondary school subjects that would be most beneficial for this career path.
+    
+    2. Key Skills: List 7-9 specific technical and soft skills needed for success in this career.
+    
+    3. Recommended Online Courses: Suggest 4-5 specific online courses or certifications (with platform names like Coursera, edX, etc.) that would help someone prepare for this career.
+    
+    4. University Majors: List 4-6 specific university majors or degree programs that could lead to this career.
+    
+    Format each section with bullet points for clarity. Be specific, practical, and focused on actionable educational paths.
+    """
+    return [
+        {"role": "system", "content": "You are a career education specialist who provides practical educational guidance."},
+        {"role": "user", "content": prompt}
+    ]
+
+class _Call(typing.NamedTuple):
+    """One LLM request: its prompt, cache key and failure handling"""
+    kind: str
+    messages: list
+    max_tokens: int
+    key: str
+    error_prefix: str
+    fallback: str
+
+def _explanation_call(career, user_interests, current_skills, desired_skills, selected_sdgs, sdgs):
+    return _Call(
+        "explanation",
+        explanation_messages(career, user_interests, current_skills, desired_skills, selected_sdgs, sdgs),
+        EXPLANATION_MAX_TOKENS,
+        explanation_cache_key(career, user_interests, current_skills, desired_skills, selected_sdgs),
+        "Error generating explanation",
+        EXPLANATION_FALLBACK
+    )
+
+def _detail_call(career_title):
+    return _Call(
+        "detail",
+        detail_messages(career_title),
+        DETAIL_MAX_TOKENS,
+        detail_cache_key(career_title),
+        "Error getting career details",
+        DETAIL_FALLBACK
+    )
+
+def _cached(call, cache):
+    """The cached response for `call`, recording the lookup in the metrics"""
+    if cache is None:
+        return None
+    with tracing.span("cache.get", "cache", kind=call.kind):
+        cached = cache.get(call.key)
+    metrics.REGISTRY.record_cache(call.kind, cached is not None)
+    return cached
+
+def _complete(client, call, cache, on_error, flight, deadline, local_text):
+    cached = _cached(call, cache)
+    if cached is not None:
+        return cached
+
+    def create():
+        timer = metrics.REGISTRY.time_call(call.kind, MODEL)
+        try:
+            response = client.chat.completions.create(
+                model=MODEL,
+                messages=call.messages,
+                max_tokens=call.max_tokens
+            )
+        except Exception as e:
+            timer.finish(error=e)
+            raise
+        timer.finish(usage=getattr(response, "usage", None))
+        text = response.choices[0].message.content
+        if cache is not None:
+            cache.set(call.key, text)
+        return text
+
+    def run():
+        return create() if flight is None else flight.do(call.key, create)
+
+    try:
+        if deadline is None:
+            with tracing.span(f"llm.{call.kind}", "llm"):
+                return run()
+        future = _background_executor().submit(run)
+        try:
+            with tracing.span(f"llm.{call.kind}", "llm", deadline=deadline):
+                return future.result(timeout=deadline)
+        except concurrent.futures.TimeoutError:
+            # The call carries on in the background and caches its response for the next view
+            logger.info("%s call exceeded its %.1fs budget; using local text", call.kind, deadline)
+            return local_text if local_text is not None else call.fallback
+    except Exception as e:
+        _report_error(f"{call.error_prefix}: {e}", on_error)
+        return call.fallback
+
+_STREAM_DONE = object()
+
+def _produce_stream(client, call, cache, flight, chunks):
+    parts = []
+    error = None
+    usage = None
+    timer = metrics.REGISTRY.time_call(call.kind, MODEL)
+    try:
+        stream = client.chat.completions.create(
+            model=MODEL,
+            messages=call.messages,
+            max_tokens=call.max_tokens,
+            stream=True,
+            stream_options={"include_usage": True}
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                timer.mark_first_token()
+                parts.append(chunk.choices[0].delta.content)
+                chunks.put(chunk.choices[0].delta.content)
+            # With include_usage, the last chunk has no choices and carries the token counts
+            usage = getattr(chunk, "usage", None) or usage
+        timer.finish(usage=usage)
+        # Only complete responses are cached
+        if cache is not None:
+            cache.set(call.key, "".join(parts))
+    except Exception as e:
+        error = e
+        timer.finish(usage=usage, error=e)
+    finally:
+        if flight is not None:
+            flight.complete(call.key, result="".join(parts), error=error)
+        chunks.put(_STREAM_DONE if error is None else error)
+
+def _stream(client, call, cache, on_error, flight, deadline, local_text):
+    cached = _cached(call, cache)
+    if cached is not None:
+        yield cached
+        return
+    fallback = local_text if local_text is not None else call.fallback
+    if flight is not None:
+        future, leader = flight.join(call.key)
+        if not leader:
+            # Someone else is already generating this text; wait for all of it
+            try:
+                with tracing.span(f"llm.{call.kind}.wait", "llm", deadline=deadline):
+                    if deadline is not None and (flight.timeout is None or deadline < flight.timeout):
+                        text = future.result(timeout=deadline)
+                    else:
+                        text = flight.wait(future)
+            except concurrent.futures.TimeoutError as e:
+                if deadline is None:
+                    _report_error(f"{call.error_prefix}: {e}", on_error)
+                text = fallback
+            except Exception as e:
+                _report_error(f"{call.error_prefix}: {e}", on_error)
+                text = call.fallback
+            yield text
+            return
+
+    # A background producer reads the stream, so the response is finished and
+    # cached even if this generator is abandoned or the deadline passes
+    chunks = queue.Queue()
+    _background_executor().submit(_produce_stream, client, call, cache, flight, chunks)
+    try:
+        with tracing.span(f"llm.{call.kind}.first_token", "llm", deadline=deadline):
+            item = chunks.get(timeout=deadline)
+    except queue.Empty:
+        logger.info("%s stream produced nothing within its %.1fs budget; using local text", call.kind, deadline)
+        yield fallback
+        return
+    received = False
+    while item is not _STREAM_DONE:
+        if isinstance(item, Exception):
+            _report_error(f"{call.error_prefix}: {item}", on_error)
+            yield ("\n\n" if received else "") + call.fallback
+            return
+        received = True
+        yield item
+        item = chunks.get()
+
+def generate_career_explanation(client, career, user_interests, current_skills, desired_skills, selected_sdgs,
+                                sdgs=None, on_error=None, cache=None, flight=None, deadline=None):
+    """Generate AI explanation for why a career matches the user's profile.
+
+    Responses are reused from `cache` when given, and concurrent identical
+    requests share one call through the `flight` SingleFlight when given.
+    With a `deadline` in seconds, a scored career (one with match_details)
+    gets local_explanation() once the budget runs out, while the real
+    response is still generated in the background and cached.
+    """
+    call = _explanation_call(career, user_interests, current_skills, desired_skills, selected_sdgs, sdgs)
+    local_text = local_explanation(career, sdgs) if "match_details" in career else None
+    return _complete(client, call, cache, on_error, flight, deadline, local_text)
+
+def stream_career_explanation(client, career, user_interests, current_skills, desired_skills, selected_sdgs,
+                              sdgs=None, on_error=None, cache=None, flight=None, deadline=None):
+    """Like generate_career_explanation, but yields text chunks as the model produces them.
+
+    The `deadline` bounds the wait for the first token; once text is flowing
+    it streams to the end.
+    """
+    call = _explanation_call(career, user_interests, current_skills, desired_skills, selected_sdgs, sdgs)
+    local_text = local_explanation(career, sdgs) if "match_details" in career else None
+    return _stream(client, call, cache, on_error, flight, deadline, local_text)
+
+def get_detailed_career_info(client, career_title, on_error=None, cache=None, flight=None, deadline=None,
+                             local_text=None):
+    """Get detailed information about a career using AI, with the same `cache`, `flight` and
+    `deadline` handling; `local_text` is returned when the budget runs out"""
+    return _complete(client, _detail_call(career_title), cache, on_error, flight, deadline, local_text)
+
+def stream_detailed_career_info(client, career_title, on_error=None, cache=None, flight=None, deadline=None,
+                                local_text=None):
+    """Like get_detailed_career_info, but yields text chunks as the model produces them"""
+    return _stream(client, _detail_call(career_title), cache, on_error, flight, deadline, local_text)
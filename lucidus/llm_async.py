@@ -0,0 +1,171 @@
+"""Asyncio counterparts of the LLM helpers, for generating many responses at once."""
+import asyncio
+import queue
+import threading
+import time
+
+from lucidus import llm, metrics
+
+def create_async_client(api_key, **kwargs):
+    # Imported lazily so the core stays cheap to import
+    import openai
+    return openai.AsyncOpenAI(api_key=api_key, **kwargs)
+
+async def _acreate_explanation(client, messages, on_chunk):
+    timer = metrics.REGISTRY.time_call("explanation", llm.MODEL)
+    usage = None
+    try:
+        if on_chunk is None:
+            response = await client.chat.completions.create(
+                model=llm.MODEL,
+                messages=messages,
+                max_tokens=llm.EXPLANATION_MAX_TOKENS
+            )
+            usage = getattr(response, "usage", None)
+            explanation = response.choices[0].message.content
+        else:
+            parts = []
+            stream = await client.chat.completions.create(
+                model=llm.MODEL,
+                messages=messages,
+                max_tokens=llm.EXPLANATION_MAX_TOKENS,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    timer.mark_first_token()
+                    parts.append(chunk.choices[0].delta.content)
+                    on_chunk("".join(parts))
+                usage = getattr(chunk, "usage", None) or usage
+            explanation = "".join(parts)
+    except Exception as e:
+        timer.finish(usage=usage, error=e)
+        raise
+    timer.finish(usage=usage)
+    return explanation
+
+async def agenerate_career_explanation(client, career, user_interests, current_skills, desired_skills, selected_sdgs,
+                                       sdgs=None, on_error=None, cache=None, on_chunk=None, flight=None):
+    """Async generate_career_explanation; with `on_chunk`, the response is streamed
+    and on_chunk(text_so_far) is called as tokens arrive.
+
+    With a `flight` SingleFlight, a request identical to one already in
+    flight, from this or another session, waits for that call's complete
+    text instead of making its own.
+    """
+    key = llm.explanation_cache_key(career, user_interests, current_skills, desired_skills, selected_sdgs)
+    if cache is not None:
+        cached = cache.get(key)
+        metrics.REGISTRY.record_cache("explanation", cached is not None)
+        if cached is not None:
+            return cached
+    if flight is not None:
+        future, leader = flight.join(key)
+        if not leader:
+            try:
+                # Shielded, so giving up here leaves the leader's future alone
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), flight.timeout)
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = f"timed out after {flight.timeout}s waiting for an identical in-flight request"
+                llm._report_error(f"Error generating explanation: {e}", on_error)
+                return llm.EXPLANATION_FALLBACK
+    messages = llm.explanation_messages(career, user_interests, current_skills, desired_skills, selected_sdgs, sdgs)
+    try:
+        explanation = await _acreate_explanation(client, messages, on_chunk)
+    except BaseException as e:
+        if flight is not None:
+            flight.complete(key, error=e)
+        if not isinstance(e, Exception):
+            raise
+        llm._report_error(f"Error generating explanation: {e}", on_error)
+        return llm.EXPLANATION_FALLBACK
+    if cache is not None:
+        cache.set(key, explanation)
+    if flight is not None:
+        flight.complete(key, result=explanation)
+    return explanation
+
+async def explain_careers(client, careers, user_interests, current_skills, desired_skills, selected_sdgs,
+                          sdgs=None, concurrency=6, on_error=None, cache=None, on_chunk=None, flight=None):
+    """Yield (career, explanation) pairs as each completes.
+
+    At most `concurrency` requests are in flight at once, so with enough
+    headroom the whole batch takes about as long as the slowest single call.
+    With `on_chunk`, responses are streamed and on_chunk(career, text_so_far)
+    is called as tokens arrive.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def explain(career):
+        async with semaphore:
+            return career, await agenerate_career_explanation(
+                client, career, user_interests, current_skills, desired_skills, selected_sdgs,
+                sdgs=sdgs, on_error=on_error, cache=cache, flight=flight,
+                on_chunk=None if on_chunk is None else lambda text: on_chunk(career, text)
+            )
+
+    for result in asyncio.as_completed([explain(career) for career in careers]):
+        yield await result
+
+class BackgroundLoop:
+    """An event loop running forever on a daemon thread.
+
+    Coroutines submitted here outlive the caller that started them, so a
+    request abandoned at its deadline still completes and fills the cache.
+    Async clients used with it must only ever be used on this loop.
+    """
+
+    def __init__(self, name="lucidus-llm-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coro):
+        """Schedule `coro` on the loop; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+def explain_careers_within(loop, client, careers, user_interests, current_skills, desired_skills, selected_sdgs,
+                           deadline=None, sdgs=None, concurrency=6, cache=None, stream=False, flight=None):
+    """Run explain_careers on a BackgroundLoop and yield ``(event, career, text)`` from the calling thread.
+
+    Events are ``"chunk"`` (text so far, when streaming), ``"error"`` (a
+    message to show) and ``"done"`` (the final explanation). Once `deadline`
+    seconds have passed, each unfinished career is yielded once as
+    ``"late"`` with its local_explanation(); its request carries on in the
+    background and lands in `cache` for the next view.
+    """
+    events = queue.Queue()
+    careers = list(careers)
+
+    def on_chunk(career, text):
+        events.put(("chunk", career, text))
+
+    async def run():
+        async for career, explanation in explain_careers(
+            client, careers, user_interests, current_skills, desired_skills, selected_sdgs,
+            sdgs=sdgs, concurrency=concurrency, cache=cache, flight=flight,
+            on_error=lambda message: events.put(("error", None, message)),
+            on_chunk=on_chunk if stream else None
+        ):
+            events.put(("done", career, explanation))
+
+    loop.submit(run())
+    expires = None if deadline is None else time.monotonic() + deadline
+    remaining = {career["id"]: career for career in careers}
+    while remaining:
+        try:
+            timeout = None if expires is None else max(0.0, expires - time.monotonic())
+            event, career, text = events.get(timeout=timeout)
+        except queue.Empty:
+            for career in remaining.values():
+                yield "late", career, llm.local_explanation(career, sdgs)
+            return
+        if event == "done":
+            remaining.pop(career["id"], None)
+        yield event, career, text
@@ -0,0 +1,80 @@
+"""Ranked match results shared across sessions.
+
+Many students pick the same popular combinations of interests, skills and
+SDGs. :class:`MatchMemo` keeps the ranked matches of recent profiles in a
+size-bounded LRU, keyed by catalog version, the order-independent
+canonical :class:`lucidus.records.Profile` and the number of matches, so
+a repeated profile skips scoring altogether.
+
+Results are computed for the canonical profile and returned as tuples
+shared by every session that asks for the same profile, so callers must
+not modify them. The match masks refer to the canonical profile's ids;
+unpack them with the profile returned alongside, and put the details back
+in the user's selection order with
+:func:`lucidus.scoring.order_match_details`.
+
+Lookups are counted per `source`, so speculative lookups (``"prefetch"``)
+do not skew the hit rate of the ones users wait for (``"results"``).
+"""
+import collections
+import threading
+
+from lucidus.cache import LRUCache
+from lucidus.records import Profile
+from lucidus.session_memory import estimate_bytes
+
+class MatchMemo:
+    """Shared LRU of compact_matches() results, bounded by entry count and estimated size"""
+
+    def __init__(self, max_entries=4096, max_bytes=8 * 1024 * 1024):
+        self._cache = LRUCache(max_entries=max_entries, max_bytes=max_bytes, sizeof=estimate_bytes)
+        self.hits = collections.Counter()
+        self.misses = collections.Counter()
+        self._lock = threading.Lock()
+
+    def compact_matches(self, career_catalog, interests, current_skills, desired_skills, selected_sdgs, limit=6,
+                        source="results"):
+        """(canonical Profile, matches) for the given selections; the matches are a shared tuple of
+        (id, score, mask)"""
+        profile = Profile.from_selections(
+            career_catalog.taxonomy, interests, current_skills, desired_skills, selected_sdgs
+        ).canonical()
+        key = (career_catalog.version, profile, limit)
+        matches = self._cache.get(key)
+        with self._lock:
+            (self.misses if matches is None else self.hits)[source] += 1
+        if matches is None:
+            matches = tuple(career_catalog.engine.compact_profile_matches(profile, limit=limit))
+            self._cache.set(key, matches)
+        return profile, matches
+
+    def summary(self, source="results"):
+        """Size of the memo, and lookups from `source`"""
+        with self._lock:
+            hits, misses = self.hits[source], self.misses[source]
+        return {
+            "entries": len(self._cache),
+            "bytes": self._cache.nbytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+
+    def to_prometheus(self):
+        """Counters and gauges in the Prometheus text exposition format"""
+        with self._lock:
+            sources = sorted(set(self.hits) | set(self.misses))
+            counters = (
+                ("lucidus_match_memo_hits_total", "Match lookups served from the memo", self.hits.copy()),
+                ("lucidus_match_memo_misses_total", "Match lookups that scored the catalog", self.misses.copy()),
+            )
+        lines = []
+        for name, help_text, by_source in counters:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            lines += [f'{name}{{source="{source}"}} {by_source[source]!r}' for source in sources]
+        for name, help_text, value in (
+            ("lucidus_match_memo_entries", "Profiles with memoized matches", len(self._cache)),
+            ("lucidus_match_memo_bytes", "Estimated size of the memoized matches", self._cache.nbytes),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value!r}"]
+        return "\n".join(lines) + "\n"
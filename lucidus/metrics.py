@@ -0,0 +1,257 @@
+"""Usage, latency and cost metrics for OpenAI calls.
+
+The LLM helpers record every ``chat.completions.create`` call into the
+process-wide :data:`REGISTRY`, labelled by call kind (``explanation`` or
+``detail``). The registry renders itself in the Prometheus text exposition
+format, which can be written to a file for a node exporter's textfile
+collector or served over HTTP::
+
+    from lucidus import metrics
+    metrics.serve(9108)                         # http://127.0.0.1:9108/metrics
+    metrics.write_periodically("lucidus.prom")  # every 15 seconds
+"""
+import bisect
+import collections
+import http.server
+import os
+import tempfile
+import threading
+import time
+
+# US dollars per million (prompt, completion) tokens
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+def estimate_cost(model, prompt_tokens, completion_tokens):
+    """Dollar cost of a call from its token usage; 0.0 for models without a known price"""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+class Histogram:
+    """Cumulative-bucket histogram that also keeps the latest `window` samples for quantiles"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS, window=2048):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._recent = collections.deque(maxlen=window)
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self._recent.append(value)
+
+    def quantile(self, q):
+        """Nearest-rank quantile of the recent samples, or None before any observation"""
+        if not self._recent:
+            return None
+        ordered = sorted(self._recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class _KindStats:
+    def __init__(self):
+        self.latency = Histogram()
+        self.first_token = Histogram()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.errors = collections.Counter()
+
+class CallTimer:
+    """Times one upstream call; created by LLMMetrics.time_call()"""
+
+    def __init__(self, metrics, kind, model):
+        self.metrics = metrics
+        self.kind = kind
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token = None
+
+    def mark_first_token(self):
+        if self.first_token is None:
+            self.first_token = time.perf_counter() - self.started
+
+    def finish(self, usage=None, error=None):
+        self.metrics.record_call(
+            self.kind, self.model, time.perf_counter() - self.started, first_token=self.first_token,
+            usage=usage, error=error
+        )
+
+class LLMMetrics:
+    """Thread-safe per-kind aggregates of OpenAI calls and cache lookups"""
+
+    def __init__(self):
+        self._kinds = collections.defaultdict(_KindStats)
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def add_collector(self, collect):
+        """Append the text returned by `collect()` to every Prometheus rendering, for other app gauges"""
+        with self._lock:
+            self._collectors.append(collect)
+
+    def time_call(self, kind, model):
+        return CallTimer(self, kind, model)
+
+    def record_call(self, kind, model, seconds, first_token=None, usage=None, error=None):
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        with self._lock:
+            stats = self._kinds[kind]
+            stats.calls += 1
+            stats.latency.observe(seconds)
+            if first_token is not None:
+                stats.first_token.observe(first_token)
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost += estimate_cost(model, prompt_tokens, completion_tokens)
+            if error is not None:
+                stats.errors[type(error).__name__] += 1
+
+    def record_cache(self, kind, hit):
+        with self._lock:
+            if hit:
+                self._kinds[kind].cache_hits += 1
+            else:
+                self._kinds[kind].cache_misses += 1
+
+    def summary(self):
+        """Per-kind dict of totals and latency quantiles, for dashboards"""
+        with self._lock:
+            return {
+                kind: {
+                    "calls": stats.calls,
+                    "errors": dict(stats.errors),
+                    "prompt_tokens": stats.prompt_tokens,
+                    "completion_tokens": stats.completion_tokens,
+                    "cost_usd": stats.cost,
+                    "cache_hits": stats.cache_hits,
+                    "cache_misses": stats.cache_misses,
+                    "latency": {f"p{round(q * 100)}": stats.latency.quantile(q) for q in QUANTILES},
+                    "first_token": {f"p{round(q * 100)}": stats.first_token.quantile(q) for q in QUANTILES},
+                }
+                for kind, stats in sorted(self._kinds.items())
+            }
+
+    def to_prometheus(self):
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ",".join(f'{key}="{value_}"' for key, value_ in labels)
+                lines.append(f"{name}{suffix}{{{label_text}}} {value!r}")
+
+        def histogram(name, help_text, pick):
+            samples = []
+            for kind, stats in kinds:
+                hist = pick(stats)
+                cumulative = 0
+                for bound, count in zip(hist.buckets + (float("inf"),), hist.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    samples.append(("_bucket", (("kind", kind), ("le", le)), cumulative))
+                samples.append(("_sum", (("kind", kind),), hist.sum))
+                samples.append(("_count", (("kind", kind),), hist.count))
+            metric(name, "histogram", help_text, samples)
+            quantiles = [
+                ("", (("kind", kind), ("quantile", repr(q))), value)
+                for kind, stats in kinds
+                for q in QUANTILES
+                if (value := pick(stats).quantile(q)) is not None
+            ]
+            metric(f"{name}_recent", "gauge", f"{help_text}, quantiles over recent calls", quantiles)
+
+        with self._lock:
+            kinds = sorted(self._kinds.items())
+            histogram("lucidus_llm_latency_seconds", "Wall time of OpenAI calls", lambda stats: stats.latency)
+            histogram(
+                "lucidus_llm_first_token_seconds", "Time to first token of streamed OpenAI calls",
+                lambda stats: stats.first_token
+            )
+            metric("lucidus_llm_calls_total", "counter", "OpenAI calls made",
+                   [("", (("kind", kind),), stats.calls) for kind, stats in kinds])
+            metric("lucidus_llm_tokens_total", "counter", "Tokens reported by OpenAI usage", [
+                ("", (("kind", kind), ("type", token_type)), count)
+                for kind, stats in kinds
+                for token_type, count in (("prompt", stats.prompt_tokens), ("completion", stats.completion_tokens))
+            ])
+            metric("lucidus_llm_cost_usd_total", "counter", "Estimated OpenAI spend in US dollars",
+                   [("", (("kind", kind),), stats.cost) for kind, stats in kinds])
+            metric("lucidus_llm_cache_requests_total", "counter", "Response cache lookups", [
+                ("", (("kind", kind), ("result", result)), count)
+                for kind, stats in kinds
+                for result, count in (("hit", stats.cache_hits), ("miss", stats.cache_misses))
+            ])
+            metric("lucidus_llm_errors_total", "counter", "Failed OpenAI calls by exception class", [
+                ("", (("kind", kind), ("error", error)), count)
+                for kind, stats in kinds
+                for error, count in sorted(stats.errors.items())
+            ])
+            collectors = list(self._collectors)
+        return "\n".join(lines) + "\n" + "".join(collect() for collect in collectors)
+
+    def write_prometheus(self, path):
+        """Atomically write the metrics to `path`, e.g. for a textfile collector"""
+        directory = os.path.dirname(os.path.abspath(path))
+        with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(f.name, path)
+
+    def write_periodically(self, path, interval=15.0):
+        """Rewrite `path` every `interval` seconds from a daemon thread"""
+        def run():
+            while True:
+                self.write_prometheus(path)
+                time.sleep(interval)
+
+        threading.Thread(target=run, name="lucidus-metrics-file", daemon=True).start()
+
+    def serve(self, port, host="127.0.0.1"):
+        """Serve the metrics at http://host:port/metrics from a daemon thread; returns the server"""
+        registry = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="lucidus-metrics", daemon=True).start()
+        return server
+
+# Every LLM helper in the process records here
+REGISTRY = LLMMetrics()
+
+def write_prometheus(path):
+    REGISTRY.write_prometheus(path)
+
+def write_periodically(path, interval=15.0):
+    REGISTRY.write_periodically(path, interval)
+
+def serve(port, host="127.0.0.1"):
+    return REGISTRY.serve(port, host)
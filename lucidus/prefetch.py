@@ -0,0 +1,125 @@
+"""Background prefetching of LLM responses the user is likely to ask for next."""
+import concurrent.futures
+import sys
+import threading
+
+class Prefetcher:
+    """Thread pool running keyed background jobs, shared by all sessions.
+
+    A key has at most one job in flight; submitting it again returns the same
+    future, so a foreground request can wait on the prefetch instead of issuing
+    a second call. Finished jobs are forgotten, since their results are
+    expected to land in a cache.
+
+    Submitters may name themselves as the `holder` of a job; release() then
+    only cancels it once no other holder still wants it.
+    """
+
+    def __init__(self, max_workers=4):
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="lucidus-prefetch"
+        )
+        self._futures = {}
+        self._holders = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, holder=None, **kwargs):
+        with self._lock:
+            future = self._futures.get(key)
+            started = future is None
+            if started:
+                future = self._executor.submit(fn, *args, **kwargs)
+                self._futures[key] = future
+                self._holders[key] = set()
+            if holder is not None:
+                self._holders[key].add(holder)
+        if started:
+            # Outside the lock: a job that already finished runs the callback right here
+            future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def _forget(self, key, future):
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+                del self._holders[key]
+
+    def in_flight(self, key):
+        """The pending or running future for `key`, if any"""
+        with self._lock:
+            return self._futures.get(key)
+
+    def cancel(self, key):
+        """Cancel the job for `key` if it has not started; returns True on success"""
+        future = self.in_flight(key)
+        return future is not None and future.cancel()
+
+    def release(self, key, holder):
+        """Drop `holder`'s interest in `key`, cancelling the job if nobody else holds it"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                return False
+            holders = self._holders[key]
+            holders.discard(holder)
+            if holders:
+                return False
+        return future.cancel()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._futures)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+class SessionPrefetch:
+    """One session's share of a Prefetcher, capped at `cap` outstanding jobs.
+
+    A job stops counting against the cap once it finishes or the session
+    releases it with cancel(), so a long-lived session keeps prefetching
+    for every new set of matches.
+    """
+
+    def __init__(self, prefetcher, cap=12):
+        self.prefetcher = prefetcher
+        self.cap = cap
+        self.outstanding = set()
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, **kwargs):
+        """Prefetch `key` unless the session already has `cap` jobs outstanding; returns the future or None"""
+        with self._lock:
+            added = key not in self.outstanding
+            if added:
+                if len(self.outstanding) >= self.cap:
+                    return None
+                self.outstanding.add(key)
+        future = self.prefetcher.submit(key, fn, *args, holder=self, **kwargs)
+        if added:
+            future.add_done_callback(lambda done: self._finished(key))
+        return future
+
+    def _finished(self, key):
+        with self._lock:
+            self.outstanding.discard(key)
+
+    def __sizeof__(self):
+        # The Prefetcher is shared by every session, so only the outstanding keys count
+        with self._lock:
+            return (
+                object.__sizeof__(self) + sys.getsizeof(self.outstanding)
+                + sum(map(sys.getsizeof, self.outstanding))
+            )
+
+    def cancel(self, keep=()):
+        """Cancel this session's jobs that have not started, except those in `keep`.
+
+        Jobs another session also submitted keep running for that session.
+        Released jobs no longer count against the cap.
+        """
+        with self._lock:
+            released = [key for key in self.outstanding if key not in keep]
+            self.outstanding.difference_update(released)
+        for key in released:
+            self.prefetcher.release(key, self)
@@ -0,0 +1,159 @@
+"""Compact career and profile records over interned taxonomy ids.
+
+A :class:`Taxonomy` gives every interest and skill label a small integer
+id, so careers and profiles store tuples of ids instead of lists of long
+strings, and each label string exists once per catalog. :class:`Career`
+still reads like the dict form of ``load_career_data()``, with
+``career["interests"]`` resolving labels through the taxonomy, so code
+written against dicts keeps working.
+"""
+import collections.abc
+import sys
+import typing
+
+class Taxonomy:
+    """Interned ids for interest and skill labels, and column order for SDGs.
+
+    Ids are positions in `interests`, `skills` and `sdgs`, assigned in
+    taxonomy order. Labels used by careers but missing from the taxonomy
+    are appended when interned.
+    """
+
+    def __init__(self, interest_categories, skill_categories, sdgs=()):
+        self.interests = []
+        self.interest_ids = {}
+        self.skills = []
+        self.skill_ids = {}
+        self.sdgs = []
+        self.sdg_index = {}
+        for names in interest_categories.values():
+            for name in names:
+                self.intern_interest(name)
+        for names in skill_categories.values():
+            for name in names:
+                self.intern_skill(name)
+        for sdg in sdgs:
+            self.intern_sdg(sdg["id"])
+
+    @classmethod
+    def from_labels(cls, interests, skills, sdg_ids):
+        """Taxonomy whose ids are the positions in the given label lists"""
+        return cls({"": interests}, {"": skills}, [{"id": sdg_id} for sdg_id in sdg_ids])
+
+    @staticmethod
+    def _add(label, labels, ids):
+        ids[label] = len(labels)
+        labels.append(sys.intern(label) if isinstance(label, str) else label)
+        return ids[label]
+
+    def intern_interest(self, label):
+        label_id = self.interest_ids.get(label)
+        return self._add(label, self.interests, self.interest_ids) if label_id is None else label_id
+
+    def intern_skill(self, label):
+        label_id = self.skill_ids.get(label)
+        return self._add(label, self.skills, self.skill_ids) if label_id is None else label_id
+
+    def intern_sdg(self, sdg_id):
+        label_id = self.sdg_index.get(sdg_id)
+        return self._add(sdg_id, self.sdgs, self.sdg_index) if label_id is None else label_id
+
+def _pack(ids):
+    """Ids as bytes when they all fit, which takes about half the memory of a tuple"""
+    ids = tuple(ids)
+    return bytes(ids) if all(0 <= i < 256 for i in ids) else ids
+
+class Career(collections.abc.Mapping):
+    """One catalog career with its interests and skills as taxonomy ids.
+
+    Id sequences (and SDG ids) are stored as bytes when every id is below
+    256, else as tuples; both iterate as ints. It is a read-only mapping with the keys of the dict form, so
+    ``dict(career)`` gives that dict back.
+    """
+
+    __slots__ = ("id", "title", "description", "interest_ids", "skill_ids", "sdgs", "taxonomy")
+
+    FIELDS = ("id", "title", "description", "interests", "skills", "sdgs")
+
+    def __init__(self, career_id, title, description, interest_ids, skill_ids, sdgs, taxonomy):
+        self.id = career_id
+        self.title = title
+        self.description = description
+        self.interest_ids = interest_ids
+        self.skill_ids = skill_ids
+        self.sdgs = sdgs
+        self.taxonomy = taxonomy
+
+    @classmethod
+    def from_dict(cls, career, taxonomy):
+        """Record for a career dict, interning its labels into `taxonomy`"""
+        sdgs = _pack(career["sdgs"])
+        for sdg_id in sdgs:
+            taxonomy.intern_sdg(sdg_id)
+        return cls(
+            career["id"], career["title"], career["description"],
+            _pack(map(taxonomy.intern_interest, career["interests"])),
+            _pack(map(taxonomy.intern_skill, career["skills"])),
+            sdgs,
+            taxonomy,
+        )
+
+    @property
+    def interests(self):
+        return [self.taxonomy.interests[i] for i in self.interest_ids]
+
+    @property
+    def skills(self):
+        return [self.taxonomy.skills[i] for i in self.skill_ids]
+
+    def __getitem__(self, key):
+        if key == "sdgs":
+            return list(self.sdgs)
+        if key in self.FIELDS:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"Career(id={self.id!r}, title={self.title!r})"
+
+class Profile(typing.NamedTuple):
+    """A user's selections as taxonomy ids (SDG ids as-is), in selection order.
+
+    Selections the taxonomy does not know are dropped: no career can
+    match them.
+    """
+    interests: tuple
+    current_skills: tuple
+    desired_skills: tuple
+    sdgs: tuple
+
+    @classmethod
+    def from_selections(cls, taxonomy, interests, current_skills, desired_skills, selected_sdgs):
+        def ids(labels, table):
+            return tuple(table[label] for label in labels if label in table)
+
+        return cls(
+            ids(interests, taxonomy.interest_ids),
+            ids(current_skills, taxonomy.skill_ids),
+            ids(desired_skills, taxonomy.skill_ids),
+            tuple(sdg_id for sdg_id in selected_sdgs if sdg_id in taxonomy.sdg_index),
+        )
+
+    def labels(self, taxonomy):
+        """The selections as label lists, in the argument order the scoring engine takes"""
+        return (
+            [taxonomy.interests[i] for i in self.interests],
+            [taxonomy.skills[i] for i in self.current_skills],
+            [taxonomy.skills[i] for i in self.desired_skills],
+            list(self.sdgs),
+        )
+
+    def canonical(self):
+        """Order-independent form, for use as a cache key"""
+        return Profile(*(tuple(sorted(ids)) for ids in self))
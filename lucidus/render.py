@@ -0,0 +1,64 @@
+"""HTML for result cards and attribute tags, built once per catalog version.
+
+The results page is assembled from these fragments, so a rerun mostly
+joins cached strings. Styling comes from the classes in
+``assets/style.css``; the fragments carry no inline styles.
+"""
+import html
+
+def _tag(css_class, text):
+    return f"<span class='tag {css_class}'>{html.escape(text)}</span>"
+
+class RenderCache:
+    """Card and tag HTML for one catalog version.
+
+    Tags for every interest, skill and SDG are built up front. A career's
+    cards are built the first time it is displayed and reused afterwards,
+    so a large catalog only pays for the careers that get shown.
+    """
+
+    def __init__(self, career_catalog):
+        self.catalog = career_catalog
+        taxonomy = career_catalog.taxonomy
+        self.interest_tags = {label: _tag("interest-tag", label) for label in taxonomy.interests}
+        self.skill_tags = {label: _tag("skill-tag", label) for label in taxonomy.skills}
+        self.sdg_tags = {
+            sdg_id: _tag("sdg-tag", f"SDG {sdg_id}: {name}") for sdg_id, name in career_catalog.sdg_names.items()
+        }
+        self._top_cards = {}
+        self._cards = {}
+
+    def interests(self, labels):
+        return " ".join(self.interest_tags.get(label) or _tag("interest-tag", label) for label in labels)
+
+    def skills(self, labels):
+        return " ".join(self.skill_tags.get(label) or _tag("skill-tag", label) for label in labels)
+
+    def sdgs(self, sdg_ids):
+        return " ".join(self.sdg_tags.get(sdg_id) or _tag("sdg-tag", f"SDG {sdg_id}") for sdg_id in sdg_ids)
+
+    def top_card(self, career_id):
+        """Card of the top match"""
+        card = self._top_cards.get(career_id)
+        if card is None:
+            career = self.catalog.career_by_id[career_id]
+            card = self._top_cards[career_id] = (
+                "<div class='career-card top-card'>"
+                f"<div class='top-card-header'><h3>{html.escape(career['title'])}</h3></div>"
+                f"<div class='top-card-body'><p>{html.escape(career['description'])}</p></div>"
+                "</div>"
+            )
+        return card
+
+    def card(self, career_id):
+        """Card of one of the other matches"""
+        card = self._cards.get(career_id)
+        if card is None:
+            career = self.catalog.career_by_id[career_id]
+            card = self._cards[career_id] = (
+                "<div class='career-card match-card'>"
+                f"<div class='match-card-header'><h4>{html.escape(career['title'])}</h4></div>"
+                f"<div class='match-card-body'><p>{html.escape(career['description'])}</p></div>"
+                "</div>"
+            )
+        return card
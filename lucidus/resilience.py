@@ -0,0 +1,269 @@
+"""Client-side rate limiting, retries and circuit breaking for OpenAI calls.
+
+:class:`ResilientClient` and :class:`AsyncResilientClient` wrap an OpenAI
+client (or any object with ``chat.completions.create``) and can share one
+:class:`RateLimiter` and :class:`CircuitBreaker`, so every session in a
+process draws from the same budget and sees the same upstream health.
+"""
+import asyncio
+import random
+import threading
+import time
+import types
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling upstream while the circuit breaker is open"""
+
+def is_retryable(error):
+    """Whether an error is transient: rate limits, timeouts, connection drops and 5xx"""
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        import openai
+    except ImportError:
+        return False
+    return isinstance(error, (openai.APITimeoutError, openai.APIConnectionError))
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+def estimate_tokens(request):
+    """Rough token cost of a chat request: ~4 characters per prompt token plus max_tokens"""
+    prompt_chars = sum(len(message.get("content") or "") for message in request.get("messages", ()))
+    return prompt_chars // 4 + (request.get("max_tokens") or 0)
+
+class _Bucket:
+    def __init__(self, per_minute, clock):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def reserve(self, amount):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= amount
+        return max(0.0, -self.tokens / self.rate)
+
+class RateLimiter:
+    """Token buckets on requests per minute and tokens per minute.
+
+    reserve() books capacity immediately and returns how long the caller must
+    wait before sending, so waiting callers are served in arrival order and
+    both threads and coroutines can use the same limiter.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, clock=time.monotonic):
+        self._requests = _Bucket(requests_per_minute, clock) if requests_per_minute else None
+        self._tokens = _Bucket(tokens_per_minute, clock) if tokens_per_minute else None
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        with self._lock:
+            wait = 0.0
+            if self._requests is not None:
+                wait = max(wait, self._requests.reserve(1))
+            if self._tokens is not None:
+                wait = max(wait, self._tokens.reserve(tokens))
+            return wait
+
+class CircuitBreaker:
+    """Fail fast after `failure_threshold` consecutive failed requests.
+
+    A request counts once, after its retries are used up, and only for
+    failures that say upstream is unhealthy: timeouts, connection drops and
+    5xx. Rate limits are left to the limiter and backoff.
+
+    While open, calls raise CircuitOpenError without touching upstream. After
+    `reset_timeout` seconds one trial call is let through (half-open); its
+    success closes the circuit and its failure opens it again. A trial that
+    ends without an outcome, such as a cancelled task, hands the slot back
+    with release_trial().
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may go upstream; returns True for the half-open trial"""
+        with self._lock:
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return False
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            raise CircuitOpenError("OpenAI is unavailable; not retrying until the circuit breaker resets")
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self._trial_in_flight = False
+
+    def release_trial(self):
+        """Let another trial through after one that ended without an outcome; counts no failure"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+
+class _Resilience:
+    def __init__(self, limiter, breaker, max_attempts, base_delay, max_delay, rng):
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rng = rng
+        self.retries = 0
+
+    def begin(self):
+        """Check the breaker once per request; returns True if the request is the half-open trial"""
+        return self.breaker is not None and self.breaker.before_call()
+
+    def admit(self, request):
+        """Book rate-limit capacity for an attempt; returns seconds to wait"""
+        if self.limiter is None:
+            return 0.0
+        return self.limiter.reserve(estimate_tokens(request))
+
+    def backoff(self, attempt, error):
+        """Seconds to sleep before retrying `error`, or None to give up"""
+        retryable = is_retryable(error)
+        if not retryable or attempt >= self.max_attempts:
+            # The request has failed; it counts against the breaker once
+            if self.breaker is not None:
+                if retryable and getattr(error, "status_code", None) != 429:
+                    self.breaker.record_failure()
+                else:
+                    # The upstream answered; a bad request or a rate limit says nothing about its health
+                    self.breaker.record_success()
+            return None
+        self.retries += 1
+        # Full jitter, but never sooner than the server asked for
+        delay = self.rng() * min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return max(delay, _retry_after(error) or 0.0)
+
+    def succeeded(self):
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def abandoned(self, trial):
+        """The request ended without an outcome (cancelled, interrupted); free its trial slot"""
+        if trial:
+            self.breaker.release_trial()
+
+class ResilientClient:
+    """Drop-in wrapper adding rate limiting, jittered retries and circuit breaking.
+
+    Only creating a request is retried; a stream that fails midway is not
+    restarted. Disable the SDK's own retries (``max_retries=0``) so attempts
+    are not multiplied.
+    """
+
+    def __init__(self, client, limiter=None, breaker=None, max_attempts=4, base_delay=0.5, max_delay=8.0,
+                 sleep=time.sleep, rng=random.random):
+        self.client = client
+        self.resilience = _Resilience(limiter, breaker, max_attempts, base_delay, max_delay, rng)
+        self.sleep = sleep
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    def _create(self, **request):
+        trial = self.resilience.begin()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                wait = self.resilience.admit(request)
+                if wait:
+                    self.sleep(wait)
+                try:
+                    response = self.client.chat.completions.create(**request)
+                except Exception as e:
+                    delay = self.resilience.backoff(attempt, e)
+                    if delay is None:
+                        raise
+                    self.sleep(delay)
+                    continue
+                self.resilience.succeeded()
+                return response
+        except BaseException:
+            # Once backoff() has recorded the outcome this is a no-op
+            self.resilience.abandoned(trial)
+            raise
+
+class AsyncResilientClient:
+    """Asyncio counterpart of ResilientClient for AsyncOpenAI clients"""
+
+    def __init__(self, client, limiter=None, breaker=None, max_attempts=4, base_delay=0.5, max_delay=8.0,
+                 sleep=asyncio.sleep, rng=random.random):
+        self.client = client
+        self.resilience = _Resilience(limiter, breaker, max_attempts, base_delay, max_delay, rng)
+        self.sleep = sleep
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self._create))
+
+    async def _create(self, **request):
+        trial = self.resilience.begin()
+        attempt = 0
+        try:
+            while True:
+                attempt += 1
+                wait = self.resilience.admit(request)
+                if wait:
+                    await self.sleep(wait)
+                try:
+                    response = await self.client.chat.completions.create(**request)
+                except Exception as e:
+                    delay = self.resilience.backoff(attempt, e)
+                    if delay is None:
+                        raise
+                    await self.sleep(delay)
+                    continue
+                self.resilience.succeeded()
+                return response
+        except BaseException:
+            # Once backoff() has recorded the outcome this is a no-op
+            self.resilience.abandoned(trial)
+            raise
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return await self.client.__aexit__(*exc_info)
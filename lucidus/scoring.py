@@ -0,0 +1,332 @@
+"""Vectorized career scoring over an incidence-matrix view of the catalog."""
+import functools
+
+import numpy as np
+
+from lucidus import tracing
+from lucidus.catalog import load_career_data
+
+# Match weights for interests, current skills, desired skills and SDGs
+MATCH_WEIGHTS = np.array([3, 2, 1, 3], dtype=np.int32)
+
+class CareerScoringEngine:
+    """Career catalog compiled into incidence matrices for vectorized scoring"""
+
+    def __init__(self, careers, weights=MATCH_WEIGHTS):
+        self.careers = careers
+        self.weights = np.asarray(weights, dtype=np.int32)
+
+        # Integer ids for every attribute, in order of first appearance
+        self.interest_ids = {}
+        self.skill_ids = {}
+        self.sdg_ids = {}
+        for career in careers:
+            for interest in career["interests"]:
+                self.interest_ids.setdefault(interest, len(self.interest_ids))
+            for skill in career["skills"]:
+                self.skill_ids.setdefault(skill, len(self.skill_ids))
+            for sdg_id in career["sdgs"]:
+                self.sdg_ids.setdefault(sdg_id, len(self.sdg_ids))
+
+        # One row per career; columns are interests, then skills, then SDGs
+        self.skill_offset = len(self.interest_ids)
+        self.sdg_offset = self.skill_offset + len(self.skill_ids)
+        self.incidence = np.zeros((len(careers), self.sdg_offset + len(self.sdg_ids)), dtype=np.uint8)
+        for row, career in enumerate(careers):
+            for interest in career["interests"]:
+                self.incidence[row, self.interest_ids[interest]] = 1
+            for skill in career["skills"]:
+                self.incidence[row, self.skill_offset + self.skill_ids[skill]] = 1
+            for sdg_id in career["sdgs"]:
+                self.incidence[row, self.sdg_offset + self.sdg_ids[sdg_id]] = 1
+
+        # Inverted index: sorted career rows for every attribute column
+        self.postings = [
+            np.flatnonzero(self.incidence[:, col]).astype(np.int32)
+            for col in range(self.incidence.shape[1])
+        ]
+        self._count_postings()
+
+    @classmethod
+    def from_arrays(cls, careers, interests, skills, sdg_ids, incidence, postings, weights=MATCH_WEIGHTS):
+        """Engine over a prebuilt index, such as the memory-mapped arrays of a compiled catalog.
+
+        `interests`, `skills` and `sdg_ids` list the attribute of each
+        incidence column in order; `postings` holds the sorted career rows of
+        every column. Nothing is copied, so read-only arrays stay shared.
+        """
+        engine = cls.__new__(cls)
+        engine.careers = careers
+        engine.weights = np.asarray(weights, dtype=np.int32)
+        engine.interest_ids = {interest: col for col, interest in enumerate(interests)}
+        engine.skill_ids = {skill: col for col, skill in enumerate(skills)}
+        engine.sdg_ids = {sdg_id: col for col, sdg_id in enumerate(sdg_ids)}
+        engine.skill_offset = len(engine.interest_ids)
+        engine.sdg_offset = engine.skill_offset + len(engine.skill_ids)
+        engine.incidence = incidence
+        engine.postings = postings
+        engine._count_postings()
+        return engine
+
+    @classmethod
+    def from_records(cls, careers, taxonomy, weights=MATCH_WEIGHTS):
+        """Engine over Career records, with the taxonomy ids as incidence columns.
+
+        The ids are already integers, so the matrix and the posting lists
+        are built with a few array operations instead of a loop per cell.
+        """
+        skill_offset = len(taxonomy.interests)
+        sdg_offset = skill_offset + len(taxonomy.skills)
+        columns = [
+            list(career.interest_ids) + [skill_offset + s for s in career.skill_ids]
+            + [sdg_offset + taxonomy.sdg_index[g] for g in career.sdgs]
+            for career in careers
+        ]
+        rows = np.repeat(np.arange(len(careers), dtype=np.int64), [len(cols) for cols in columns])
+        cols = np.fromiter((col for row_cols in columns for col in row_cols), dtype=np.int64, count=len(rows))
+        width = sdg_offset + len(taxonomy.sdgs)
+        incidence = np.zeros((len(careers), width), dtype=np.uint8)
+        incidence[rows, cols] = 1
+
+        # Nonzeros of the transpose come column by column with rows sorted: every posting list at once
+        posting_cols, posting_rows = np.nonzero(incidence.T)
+        bounds = np.searchsorted(posting_cols, np.arange(width + 1))
+        posting_rows = posting_rows.astype(np.int32)
+        postings = [posting_rows[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+        return cls.from_arrays(careers, taxonomy.interests, taxonomy.skills, taxonomy.sdgs, incidence, postings, weights)
+
+    def _count_postings(self):
+        self.interest_counts = {i: len(self.postings[self._interest_column(i)]) for i in self.interest_ids}
+        self.skill_counts = {s: len(self.postings[self._skill_column(s)]) for s in self.skill_ids}
+        self.sdg_counts = {g: len(self.postings[self._sdg_column(g)]) for g in self.sdg_ids}
+
+    def _interest_column(self, interest):
+        return self.interest_ids.get(interest)
+
+    def _skill_column(self, skill):
+        col = self.skill_ids.get(skill)
+        return None if col is None else self.skill_offset + col
+
+    def _sdg_column(self, sdg_id):
+        col = self.sdg_ids.get(sdg_id)
+        return None if col is None else self.sdg_offset + col
+
+    def _label_columns(self, interests, current_skills, desired_skills, selected_sdgs):
+        """Incidence column of every selection, grouped like the arguments; None when unknown"""
+        return (
+            [self._interest_column(i) for i in interests],
+            [self._skill_column(s) for s in current_skills],
+            [self._skill_column(s) for s in desired_skills],
+            [self._sdg_column(g) for g in selected_sdgs],
+        )
+
+    def profile_columns(self, profile):
+        """Incidence columns of a :class:`lucidus.records.Profile`, grouped like its fields.
+
+        The profile's ids must come from the taxonomy the engine was built
+        over, as for the engine of a Catalog, so interest and skill ids are
+        column numbers and no label is looked up.
+        """
+        return (
+            list(profile.interests),
+            [self.skill_offset + s for s in profile.current_skills],
+            [self.skill_offset + s for s in profile.desired_skills],
+            [self._sdg_column(g) for g in profile.sdgs],
+        )
+
+    def _vector(self, columns):
+        vector = np.zeros(self.incidence.shape[1], dtype=np.int32)
+        for weight, group in zip(self.weights, columns):
+            for col in group:
+                if col is not None:
+                    vector[col] += weight
+        return vector
+
+    def profile_vector(self, interests, current_skills, desired_skills, selected_sdgs):
+        """Weighted selection vector; selections unknown to the catalog contribute nothing"""
+        return self._vector(self._label_columns(interests, current_skills, desired_skills, selected_sdgs))
+
+    def candidates(self, interests=(), current_skills=(), desired_skills=(), selected_sdgs=(), match_all=False):
+        """Sorted career rows sharing any (or, with match_all, every) selected attribute.
+
+        Intersections start from the shortest posting list and stop as soon
+        as nothing is left; a selection the catalog does not know matches no
+        career.
+        """
+        columns = [col for group in self._label_columns(interests, current_skills, desired_skills, selected_sdgs)
+                   for col in group]
+        if not match_all:
+            postings = [self.postings[col] for col in columns if col is not None]
+            if not postings:
+                return np.empty(0, dtype=np.int32)
+            return np.unique(np.concatenate(postings)).astype(np.int32)
+        if not columns:
+            return np.arange(len(self.careers), dtype=np.int32)
+        if None in columns:
+            return np.empty(0, dtype=np.int32)
+        postings = sorted((self.postings[col] for col in set(columns)), key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if not len(rows):
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return np.asarray(rows, dtype=np.int32)
+
+    def score(self, interests, current_skills, desired_skills, selected_sdgs, rows=None):
+        """Score careers with a single matrix-vector product, optionally only `rows`"""
+        vector = self.profile_vector(interests, current_skills, desired_skills, selected_sdgs)
+        if rows is None:
+            return self.incidence @ vector
+        return self.incidence[rows] @ vector
+
+    def match_details(self, row, interests, current_skills, desired_skills, selected_sdgs):
+        """Selections found in the career at `row`, in selection order"""
+        career_row = self.incidence[row]
+
+        def matched(selections, column):
+            return [s for s in selections if column(s) is not None and career_row[column(s)]]
+
+        return {
+            "interest_matches": matched(interests, self._interest_column),
+            "skill_matches": {
+                "current": matched(current_skills, self._skill_column),
+                "desired": matched(desired_skills, self._skill_column)
+            },
+            "sdg_matches": matched(selected_sdgs, self._sdg_column)
+        }
+
+    def match_mask(self, row, interests, current_skills, desired_skills, selected_sdgs):
+        """match_details() packed into an int.
+
+        Bit i is set when the i-th selection is in the career, counting
+        through interests, current skills, desired skills and SDGs in turn.
+        unpack_match_details() turns it back into the dict.
+        """
+        return self._mask(row, self._label_columns(interests, current_skills, desired_skills, selected_sdgs))
+
+    def _mask(self, row, columns):
+        career_row = self.incidence[row]
+        mask = 0
+        for bit, col in enumerate(col for group in columns for col in group):
+            if col is not None and career_row[col]:
+                mask |= 1 << bit
+        return mask
+
+    def _select_top(self, rows, scores, limit):
+        """Best `limit` rows ordered by score, then catalog order (like a stable sort)"""
+        keys = -scores.astype(np.int64) * (len(self.careers) + 1) + rows
+        if len(keys) > limit:
+            keep = np.argpartition(keys, limit - 1)[:limit]
+            rows, scores, keys = rows[keep], scores[keep], keys[keep]
+        order = np.argsort(keys)
+        return rows[order], scores[order]
+
+    def top_rows(self, interests, current_skills, desired_skills, selected_sdgs, limit=6):
+        """Rows and scores of the best careers with score > 0, using max-score pruning.
+
+        Posting lists are visited from the highest weight down. Once the weights of
+        the lists not yet visited add up to less than the current k-th score, no
+        unscored career can reach the top k and the remaining lists are skipped.
+        """
+        return self._top_rows(self.profile_vector(interests, current_skills, desired_skills, selected_sdgs), limit)
+
+    def _top_rows(self, vector, limit):
+        columns = [col for col in np.flatnonzero(vector) if vector[col] > 0]
+        columns.sort(key=lambda col: (-vector[col], len(self.postings[col])))
+        bounds = np.cumsum([vector[col] for col in reversed(columns)])[::-1]
+
+        top_rows = np.empty(0, dtype=np.int32)
+        top_scores = np.empty(0, dtype=np.int32)
+        if limit <= 0:
+            return top_rows, top_scores
+        scored = np.zeros(len(self.careers), dtype=bool)
+        for col, bound in zip(columns, bounds):
+            # Ties go to the lower catalog row, so only a strictly lower bound can stop
+            if len(top_rows) == limit and bound < top_scores[-1]:
+                break
+            posting = self.postings[col]
+            rows = posting[~scored[posting]]
+            if not len(rows):
+                continue
+            scored[rows] = True
+            scores = self.incidence[rows] @ vector
+            top_rows, top_scores = self._select_top(
+                np.concatenate([top_rows, rows]), np.concatenate([top_scores, scores]), limit
+            )
+        return top_rows, top_scores
+
+    def top_matches(self, interests, current_skills, desired_skills, selected_sdgs, limit=6):
+        """Highest scoring careers with score > 0; ties keep catalog order"""
+        with tracing.span("top_rows", "scoring", limit=limit):
+            rows, scores = self.top_rows(interests, current_skills, desired_skills, selected_sdgs, limit)
+        matches = []
+        with tracing.span("materialize", "scoring", rows=len(rows)):
+            for row, score in zip(rows, scores):
+                career_with_score = dict(self.careers[row])
+                career_with_score["score"] = int(score)
+                career_with_score["match_details"] = self.match_details(
+                    row, interests, current_skills, desired_skills, selected_sdgs
+                )
+                matches.append(career_with_score)
+        return matches
+
+    def compact_matches(self, interests, current_skills, desired_skills, selected_sdgs, limit=6):
+        """Like top_matches(), as (career id, score, match mask) tuples that reference the catalog"""
+        with tracing.span("top_rows", "scoring", limit=limit):
+            rows, scores = self.top_rows(interests, current_skills, desired_skills, selected_sdgs, limit)
+        return [
+            (
+                self.careers[row]["id"], int(score),
+                self.match_mask(row, interests, current_skills, desired_skills, selected_sdgs)
+            )
+            for row, score in zip(rows, scores)
+        ]
+
+    def compact_profile_matches(self, profile, limit=6):
+        """compact_matches() for a Profile over the engine's taxonomy (see profile_columns()).
+
+        Mask bits count through the profile's ids, so unpack them with
+        ``profile.labels(taxonomy)``.
+        """
+        columns = self.profile_columns(profile)
+        with tracing.span("top_rows", "scoring", limit=limit):
+            rows, scores = self._top_rows(self._vector(columns), limit)
+        return [(self.careers[row]["id"], int(score), self._mask(row, columns)) for row, score in zip(rows, scores)]
+
+def unpack_match_details(mask, interests, current_skills, desired_skills, selected_sdgs):
+    """The match_details() dict for a match_mask() computed from the same selections"""
+    groups = []
+    bit = 0
+    for selections in (interests, current_skills, desired_skills, selected_sdgs):
+        groups.append([s for i, s in enumerate(selections) if mask >> (bit + i) & 1])
+        bit += len(selections)
+    return {
+        "interest_matches": groups[0],
+        "skill_matches": {"current": groups[1], "desired": groups[2]},
+        "sdg_matches": groups[3]
+    }
+
+def order_match_details(details, interests, current_skills, desired_skills, selected_sdgs):
+    """`details` with every list in the order of the given selections, as match_details() gives them"""
+    def ordered(matches, selections):
+        matched = set(matches)
+        return [s for s in selections if s in matched]
+
+    return {
+        "interest_matches": ordered(details["interest_matches"], interests),
+        "skill_matches": {
+            "current": ordered(details["skill_matches"]["current"], current_skills),
+            "desired": ordered(details["skill_matches"]["desired"], desired_skills),
+        },
+        "sdg_matches": ordered(details["sdg_matches"], selected_sdgs)
+    }
+
+@functools.lru_cache(maxsize=1)
+def default_engine():
+    """Scoring engine for the built-in catalog, built once per process"""
+    return CareerScoringEngine(load_career_data())
+
+def match_careers(interests, current_skills, desired_skills, selected_sdgs, limit=6, engine=None):
+    """Top `limit` scored careers for a profile given as plain selection lists"""
+    engine = engine or default_engine()
+    return engine.top_matches(interests, current_skills, desired_skills, selected_sdgs, limit=limit)
@@ -0,0 +1,70 @@
+"""Memory accounting for per-session state.
+
+:func:`estimate_bytes` approximates the deep size of a session's state by
+walking dicts, lists, tuples and sets. Other objects count their own
+``sys.getsizeof``, so helpers kept in session state that reference shared
+process-wide objects (caches, executors) define ``__sizeof__`` to report
+only their per-session part. :class:`SessionMemory` keeps the latest
+estimate for every live session, for the admin panel and the Prometheus
+export.
+"""
+import sys
+import threading
+
+def estimate_bytes(value, _seen=None):
+    """Approximate deep size of `value` in bytes, counting every object once"""
+    seen = set() if _seen is None else _seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_bytes(key, seen) + estimate_bytes(item, seen) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_bytes(item, seen) for item in value)
+    return size
+
+class SessionMemory:
+    """Latest estimated state size of every live session, keyed by session id"""
+
+    def __init__(self):
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def record(self, session_id, nbytes):
+        with self._lock:
+            self._sizes[session_id] = nbytes
+
+    def forget(self, session_id):
+        with self._lock:
+            self._sizes.pop(session_id, None)
+
+    def prune(self, is_alive):
+        """Forget every session for which `is_alive(session_id)` is false"""
+        with self._lock:
+            for session_id in [session_id for session_id in self._sizes if not is_alive(session_id)]:
+                del self._sizes[session_id]
+
+    def summary(self):
+        with self._lock:
+            sizes = list(self._sizes.values())
+        return {
+            "sessions": len(sizes),
+            "total_bytes": sum(sizes),
+            "mean_bytes": sum(sizes) / len(sizes) if sizes else 0,
+            "max_bytes": max(sizes, default=0),
+        }
+
+    def to_prometheus(self):
+        """Gauges in the Prometheus text exposition format"""
+        summary = self.summary()
+        lines = []
+        for name, help_text, value in (
+            ("lucidus_sessions_live", "Sessions with recorded state", summary["sessions"]),
+            ("lucidus_session_state_bytes_total", "Estimated state bytes across live sessions",
+             summary["total_bytes"]),
+            ("lucidus_session_state_bytes_max", "Estimated state bytes of the largest session",
+             summary["max_bytes"]),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value!r}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,90 @@
+"""Coalescing of identical concurrent requests into a single upstream call."""
+import concurrent.futures
+import threading
+
+class SingleFlight:
+    """Share one in-flight call among all concurrent callers with the same key.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is running wait on the same future and receive its result or
+    exception. Waiters give up after `timeout` seconds with
+    ``concurrent.futures.TimeoutError``. `calls` counts leader executions and
+    `coalesced` counts callers that were served by someone else's call.
+    """
+
+    def __init__(self, timeout=None):
+        self.timeout = timeout
+        self.calls = 0
+        self.coalesced = 0
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def join(self, key):
+        """Return ``(future, leader)``; a leader must later call complete() for `key`"""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = concurrent.futures.Future()
+            self._futures[key] = future
+            self.calls += 1
+            return future, True
+
+    def complete(self, key, result=None, error=None):
+        """Publish the leader's outcome to every waiter and retire `key`"""
+        with self._lock:
+            future = self._futures.pop(key)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def wait(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            raise concurrent.futures.TimeoutError(
+                f"timed out after {self.timeout}s waiting for an identical in-flight request"
+            ) from None
+
+    def do(self, key, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) unless a call for `key` is already in flight"""
+        future, leader = self.join(key)
+        if not leader:
+            return self.wait(future)
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self.complete(key, error=e)
+            raise
+        self.complete(key, result=result)
+        return result
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._futures)
+
+    def summary(self):
+        """Leader calls, coalesced callers and calls in flight, for dashboards"""
+        with self._lock:
+            calls, coalesced, in_flight = self.calls, self.coalesced, len(self._futures)
+        return {
+            "calls": calls,
+            "coalesced": coalesced,
+            "in_flight": in_flight,
+            "coalesced_rate": coalesced / (calls + coalesced) if calls + coalesced else 0.0,
+        }
+
+    def to_prometheus(self):
+        """Counters and gauges in the Prometheus text exposition format"""
+        summary = self.summary()
+        lines = []
+        for name, kind, help_text, value in (
+            ("lucidus_single_flight_calls_total", "counter", "Upstream calls made by a leader", summary["calls"]),
+            ("lucidus_single_flight_coalesced_total", "counter", "Callers served by another caller's identical call",
+             summary["coalesced"]),
+            ("lucidus_single_flight_in_flight", "gauge", "Upstream calls currently shared", summary["in_flight"]),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value!r}"]
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,184 @@
+"""Opt-in timing spans for Streamlit reruns.
+
+A :class:`Tracer` records one trace per rerun. While a trace is active on
+the current thread, :func:`span` and :func:`traced` record nested spans
+and :func:`section` marks consecutive top-level blocks of a script; with
+no active trace they cost one attribute lookup. Finished traces are
+appended to a file as Chrome trace events, which chrome://tracing and
+Perfetto open directly, or as one JSON event per line when the path ends
+in ``.jsonl``. With ``profile_top`` set, every rerun also runs under
+cProfile and the stats of the slowest ones are kept as ``.prof`` files.
+Only one rerun is profiled at a time, since a process can only have one
+active profiler on Python 3.12+; reruns overlapping it are traced unprofiled.
+"""
+import cProfile
+import functools
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+_local = threading.local()
+
+# Held from enabling a profile until it is disabled, possibly by another thread
+_profiling = threading.Lock()
+
+def _now_us():
+    return time.perf_counter_ns() // 1000
+
+def current():
+    """The trace active on this thread, or None"""
+    return getattr(_local, "trace", None)
+
+class Trace:
+    """Spans of one rerun; created by Tracer.start()"""
+
+    def __init__(self, seq, name, args, profile):
+        self.seq = seq
+        self.name = name
+        self.args = args
+        self.events = []
+        self.started = _now_us()
+        self.profile = profile
+        self._stack = []
+
+    def begin(self, name, cat, args=None, section=False):
+        self._stack.append((name, cat, args, _now_us(), section))
+
+    def end(self):
+        name, cat, args, started, _ = self._stack.pop()
+        self._event(name, cat, started, _now_us(), args)
+
+    def section(self, name):
+        """End the open section, with any spans left open inside it, and start the next one"""
+        while self._stack:
+            is_section = self._stack[-1][4]
+            self.end()
+            if is_section:
+                break
+        self.begin(name, "section", section=True)
+
+    def _event(self, name, cat, started, ended, args):
+        event = {
+            "name": name, "cat": cat, "ph": "X", "ts": started, "dur": ended - started,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+class span:
+    """Context manager recording a span in the active trace, if any"""
+
+    __slots__ = ("name", "cat", "args", "_trace")
+
+    def __init__(self, name, cat="app", **args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self._trace = current()
+        if self._trace is not None:
+            self._trace.begin(self.name, self.cat, self.args)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._trace is not None:
+            self._trace.end()
+
+def traced(name=None, cat="app"):
+    """Decorator recording each call of a function as a span"""
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if current() is None:
+                return fn(*args, **kwargs)
+            with span(span_name, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def section(name):
+    """Mark the start of a top-level block; it runs until the next section or the end of the trace"""
+    trace = current()
+    if trace is not None:
+        trace.section(name)
+
+class Tracer:
+    """Writes a trace per rerun to `path` and keeps cProfile stats for the slowest `profile_top` reruns"""
+
+    def __init__(self, path, profile_top=0, profile_dir="profiles"):
+        self.path = path
+        self.jsonl = path.endswith(".jsonl")
+        self.profile_top = profile_top
+        self.profile_dir = profile_dir
+        self._seq = itertools.count(1)
+        self._slowest = []
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if profile_top:
+            os.makedirs(profile_dir, exist_ok=True)
+
+    def start(self, name="rerun", **args):
+        """Begin a trace and make it active on this thread"""
+        profiled = self.profile_top and _profiling.acquire(blocking=False)
+        trace = Trace(next(self._seq), name, args, cProfile.Profile() if profiled else None)
+        _local.trace = trace
+        if profiled:
+            try:
+                trace.profile.enable()
+            except ValueError:
+                # Another profiler or debugger is active in this process
+                trace.profile = None
+                _profiling.release()
+        return trace
+
+    def finish(self, trace, **args):
+        """End every open span of `trace`, write its events and keep its profile if it is among the slowest"""
+        ended = _now_us()
+        if trace.profile is not None:
+            trace.profile.disable()
+            _profiling.release()
+        if current() is trace:
+            _local.trace = None
+        while trace._stack:
+            trace.end()
+        duration = ended - trace.started
+        trace.args.update(args)
+        profile_path = self._keep_profile(trace, duration) if trace.profile is not None else None
+        if profile_path is not None:
+            trace.args["profile"] = profile_path
+        trace._event(trace.name, "rerun", trace.started, ended, trace.args)
+        with self._lock:
+            self._write(trace.events)
+        return duration / 1e6
+
+    def _keep_profile(self, trace, duration):
+        with self._lock:
+            if len(self._slowest) >= self.profile_top and duration <= self._slowest[0][0]:
+                return None
+            path = os.path.join(self.profile_dir, f"rerun-{trace.seq}-{duration // 1000}ms.prof")
+            trace.profile.dump_stats(path)
+            if len(self._slowest) >= self.profile_top:
+                _, evicted = heapq.heapreplace(self._slowest, (duration, path))
+                os.remove(evicted)
+            else:
+                heapq.heappush(self._slowest, (duration, path))
+            return path
+
+    def _write(self, events):
+        new_file = not os.path.exists(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            if self.jsonl:
+                f.writelines(json.dumps(event) + "\n" for event in events)
+            else:
+                # The JSON array format allows a missing "]", so reruns can keep appending
+                if new_file:
+                    f.write("[\n")
+                f.writelines(json.dumps(event) + ",\n" for event in events)
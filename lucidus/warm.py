@@ -0,0 +1,155 @@
+"""Pre-generate LLM content before a deploy and ship it as a snapshot file.
+
+The warm-up job generates the detailed information for every career in the
+catalog, plus explanations for the displayed matches of the most common
+profiles, and writes them to a versioned JSON snapshot (gzipped when the
+path ends in ``.gz``)::
+
+    python -m lucidus.warm -o snapshot.json.gz --profiles common_profiles.jsonl --top-profiles 200
+
+Pass ``--fake`` to run it offline against :class:`lucidus.fakes.FakeOpenAI`.
+The app loads the snapshot named by ``LUCIDUS_SNAPSHOT`` into its caches at
+startup.
+"""
+import argparse
+import concurrent.futures
+import gzip
+import heapq
+import json
+import os
+import sys
+import threading
+import time
+
+from lucidus import batch, llm, scoring
+from lucidus.catalog_source import Catalog, CatalogError, load_catalog
+
+SNAPSHOT_FORMAT = 1
+
+class _Collector:
+    """Cache stand-in that records successful responses and never hits"""
+
+    def __init__(self):
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        with self._lock:
+            self.entries[key] = value
+
+def most_common_profiles(profiles, limit):
+    """The `limit` profiles with the highest ``count``"""
+    return heapq.nlargest(limit, profiles, key=lambda profile: profile.get("count", 1))
+
+def warm(client, careers, profiles=(), workers=4, sdgs=None, engine=None, matches_per_profile=6):
+    """Generate career details and profile explanations with bounded parallelism.
+
+    Returns a dict mapping cache keys to generated text. Failed generations
+    are left out, so they are retried on the next run or live.
+    """
+    engine = engine or scoring.CareerScoringEngine(careers)
+    collector = _Collector()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        jobs = [
+            executor.submit(llm.get_detailed_career_info, client, career["title"], cache=collector)
+            for career in careers
+        ]
+        for profile in profiles:
+            selections = (profile["interests"], profile["current_skills"], profile["desired_skills"], profile["sdgs"])
+            for career in engine.top_matches(*selections, limit=matches_per_profile):
+                jobs.append(executor.submit(
+                    llm.generate_career_explanation, client, career, *selections, sdgs=sdgs, cache=collector
+                ))
+        for job in concurrent.futures.as_completed(jobs):
+            job.result()
+    return collector.entries
+
+def _open(path, mode):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+def write_snapshot(path, entries):
+    snapshot = {
+        "format": SNAPSHOT_FORMAT,
+        "created_at": time.time(),
+        "model": llm.MODEL,
+        "explanation_prompt_version": llm.EXPLANATION_PROMPT_VERSION,
+        "detail_prompt_version": llm.DETAIL_PROMPT_VERSION,
+        "entries": entries,
+    }
+    with _open(path, "w") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+
+def read_snapshot(path):
+    with _open(path, "r") as f:
+        snapshot = json.load(f)
+    if snapshot.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {snapshot.get('format')!r} in {path}")
+    return snapshot
+
+def load_snapshot(path, detail_cache=None, explanation_cache=None):
+    """Load a snapshot's entries into the given caches; returns the number loaded.
+
+    Entries generated with a different model or prompt version are skipped.
+    """
+    snapshot = read_snapshot(path)
+    loaded = 0
+    for key, value in snapshot["entries"].items():
+        kind, *_, version, model = json.loads(key)
+        if model != llm.MODEL:
+            continue
+        if kind == "detail" and detail_cache is not None and version == llm.DETAIL_PROMPT_VERSION:
+            detail_cache.set(key, value)
+            loaded += 1
+        elif kind == "explanation" and explanation_cache is not None and version == llm.EXPLANATION_PROMPT_VERSION:
+            explanation_cache.set(key, value)
+            loaded += 1
+    return loaded
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-generate LLM content into a cache snapshot.")
+    parser.add_argument("-o", "--output", required=True, help="snapshot path (.json or .json.gz)")
+    parser.add_argument("--profiles", help="CSV or JSONL of common profiles, with an optional count column")
+    parser.add_argument("--top-profiles", type=int, default=100, help="profiles to explain (default: 100)")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent LLM calls (default: 4)")
+    parser.add_argument("--fake", action="store_true", help="use an offline fake client instead of OpenAI")
+    parser.add_argument("--catalog", help="catalog file or directory to warm up (default: built-in)")
+    args = parser.parse_args(argv)
+
+    try:
+        career_catalog = load_catalog(args.catalog) if args.catalog else Catalog.builtin()
+    except CatalogError as e:
+        parser.error(str(e))
+
+    if args.fake:
+        from lucidus.fakes import FakeOpenAI
+        client = FakeOpenAI()
+    else:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            parser.error("OPENAI_API_KEY is not set; pass --fake to warm up offline")
+        client = llm.create_client(api_key)
+
+    profiles = []
+    if args.profiles:
+        input_format = "csv" if args.profiles.lower().endswith(".csv") else "jsonl"
+        with open(args.profiles, newline="", encoding="utf-8") as f:
+            profiles = most_common_profiles(batch.read_profiles(f, input_format), args.top_profiles)
+
+    started = time.perf_counter()
+    entries = warm(
+        client, career_catalog.careers, profiles, workers=args.workers, sdgs=career_catalog.sdgs,
+        engine=career_catalog.engine
+    )
+    write_snapshot(args.output, entries)
+    print(
+        f"Wrote {len(entries)} entries to {args.output} in {time.perf_counter() - started:.1f}s",
+        file=sys.stderr
+    )
+
+if __name__ == "__main__":
+    main()
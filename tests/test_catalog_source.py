@@ -0,0 +1,62 @@
+import csv
+import json
+
+import pandas as pd
+import pytest
+
+from lucidus import catalog_source
+from lucidus.catalog_source import Catalog, load_catalog
+
+def _tables(builtin):
+    """The built-in catalog as table rows, with list values joined the way CSV and Parquet files hold them"""
+    careers = [
+        {**dict(career), **{field: ";".join(map(str, career[field])) for field in ("interests", "skills", "sdgs")}}
+        for career in builtin.careers
+    ]
+    def taxonomy(categories):
+        return [{"category": category, "name": name} for category, names in categories.items() for name in names]
+    return {
+        "careers": careers,
+        "interests": taxonomy(builtin.interest_categories),
+        "skills": taxonomy(builtin.skill_categories),
+        "sdgs": builtin.sdgs,
+    }
+
+def _write_csv(path, rows):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+def _assert_same_catalog(loaded, builtin):
+    assert [dict(career) for career in loaded.careers] == [dict(career) for career in builtin.careers]
+    assert loaded.interest_categories == builtin.interest_categories
+    assert loaded.skill_categories == builtin.skill_categories
+    assert loaded.sdgs == builtin.sdgs
+
+def test_builtin_catalog_is_valid():
+    builtin = Catalog.builtin()
+    catalog_source.validate(builtin.careers, builtin.interest_categories, builtin.skill_categories, builtin.sdgs)
+
+def test_builtin_catalog_round_trips_through_json(tmp_path):
+    builtin = Catalog.builtin()
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps({
+        "careers": [dict(career) for career in builtin.careers],
+        "interest_categories": builtin.interest_categories,
+        "skill_categories": builtin.skill_categories,
+        "sdgs": builtin.sdgs,
+    }), encoding="utf-8")
+    _assert_same_catalog(load_catalog(str(path)), builtin)
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet"])
+def test_builtin_catalog_round_trips_through_tables(tmp_path, extension):
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    builtin = Catalog.builtin()
+    for table, rows in _tables(builtin).items():
+        if extension == ".csv":
+            _write_csv(tmp_path / f"{table}.csv", rows)
+        else:
+            pd.DataFrame(rows).to_parquet(tmp_path / f"{table}.parquet")
+    _assert_same_catalog(load_catalog(str(tmp_path)), builtin)
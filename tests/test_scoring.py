@@ -0,0 +1,35 @@
+import itertools
+
+import numpy as np
+
+from lucidus import catalog, scoring
+
+def _rows(careers, wanted, match_all):
+    """Career rows found by scanning every career"""
+    def attributes(career):
+        return set(career["interests"]) | set(career["skills"]) | set(career["sdgs"])
+
+    test = (lambda found: wanted <= found) if match_all else (lambda found: bool(wanted & found))
+    return [row for row, career in enumerate(careers) if test(attributes(career))]
+
+def test_candidates_match_a_full_scan():
+    careers = catalog.load_career_data()
+    engine = scoring.CareerScoringEngine(careers)
+    for interests, skills, sdgs in itertools.product(
+        ([], ["Biology"], ["Biology", "Chemistry"], ["Physics", "Computer Science"]),
+        ([], ["Problem solving"], ["Helping people", "Data analysis"]),
+        ([], [3], [3, 13]),
+    ):
+        for match_all in (False, True):
+            rows = engine.candidates(interests, skills, (), sdgs, match_all=match_all)
+            expected = _rows(careers, set(interests) | set(skills) | set(sdgs), match_all)
+            if match_all and not (interests or skills or sdgs):
+                expected = list(range(len(careers)))
+            assert rows.tolist() == expected
+            assert rows.dtype == np.int32
+
+def test_intersection_with_an_unknown_selection_is_empty():
+    engine = scoring.CareerScoringEngine(catalog.load_career_data())
+    assert len(engine.candidates(["Biology"])) > 0
+    assert len(engine.candidates(["Biology", "Not an interest"], match_all=True)) == 0
+    assert engine.candidates(["Biology", "Not an interest"]).tolist() == engine.candidates(["Biology"]).tolist()
@@ -0,0 +1,124 @@
+"""Simulate concurrent users walking the wizard against a fake OpenAI endpoint.
+
+Each simulated user runs app.py through streamlit's AppTest on its own
+thread, picking random selections and exploring a few careers, while every
+OpenAI call goes to :mod:`lucidus.fakeserver` (started in-process unless
+``--upstream`` names one already running)::
+
+    python tools/loadtest.py --users 20 --walks 2 --latency-median 1.0 --rate-limit-rate 0.05
+
+Reports throughput, per-step click latency percentiles and upstream call
+counts, optionally as JSON with ``-o``.
+"""
+import argparse
+import collections
+import concurrent.futures
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import wizard  # noqa: E402
+
+from lucidus import fakeserver, metrics  # noqa: E402
+
+def _percentiles(values):
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]  # noqa: E731
+    return {"p50": pick(0.5), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1]}
+
+def _user(index, walks, explore, seed):
+    rng = random.Random(seed + index)
+    clicks = []
+    errors = []
+    for _ in range(walks):
+        session = wizard.WizardSession()
+        try:
+            session.walk(rng, explore=explore)
+        except Exception as e:
+            errors.append(f"{type(e).__name__}: {e}")
+        clicks.extend(session.clicks)
+    return clicks, errors
+
+def run(users, walks, explore, seed=0):
+    started = time.perf_counter()
+    clicks = []
+    errors = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=users) as executor:
+        for user_clicks, user_errors in executor.map(
+            _user, range(users), [walks] * users, [explore] * users, [seed] * users
+        ):
+            clicks.extend(user_clicks)
+            errors.extend(user_errors)
+    elapsed = time.perf_counter() - started
+
+    by_step = collections.defaultdict(list)
+    for click in clicks:
+        by_step["load" if click.action == "load" else click.step].append(click.seconds)
+    return {
+        "users": users,
+        "walks_per_user": walks,
+        "elapsed_seconds": elapsed,
+        "completed_walks": users * walks - len(errors),
+        "walks_per_second": (users * walks - len(errors)) / elapsed,
+        "clicks_per_second": len(clicks) / elapsed,
+        "steps": {step: {"clicks": len(seconds), **_percentiles(seconds)} for step, seconds in by_step.items()},
+        "errors": errors,
+        "llm": metrics.REGISTRY.summary(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the wizard with simulated users.")
+    parser.add_argument("--users", type=int, default=10, help="concurrent users (default: 10)")
+    parser.add_argument("--walks", type=int, default=1, help="wizard walks per user (default: 1)")
+    parser.add_argument("--explore", type=int, default=2, help="careers explored per walk (default: 2)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--upstream", help="base URL of a running fake server instead of an in-process one")
+    parser.add_argument("--latency-median", type=float, default=0.5)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--token-interval", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("-o", "--output", help="also write the report as JSON to this path")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.upstream:
+        base_url = args.upstream
+    else:
+        server = fakeserver.serve(fakeserver.FakeServerConfig(
+            args.latency_median, args.latency_sigma, args.token_interval, args.error_rate,
+            args.rate_limit_rate, seed=args.seed
+        ))
+        base_url = server.base_url
+    # Every session shares one process, like a single Streamlit server, with cold caches
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["LUCIDUS_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="lucidus-load-"), "cache.sqlite3")
+    os.environ.pop("LUCIDUS_SNAPSHOT", None)
+    wizard.allow_concurrent_sessions()
+
+    report = run(args.users, args.walks, args.explore, args.seed)
+    if server is not None:
+        report["upstream"] = server.snapshot()
+    else:
+        with urllib.request.urlopen(base_url.rsplit("/v1", 1)[0] + "/stats") as response:
+            report["upstream"] = json.load(response)
+
+    print(f"{report['completed_walks']} walks by {args.users} users in {report['elapsed_seconds']:.1f}s: "
+          f"{report['walks_per_second']:.2f} walks/s, {report['clicks_per_second']:.1f} clicks/s")
+    for step, stats in report["steps"].items():
+        print(f"  {step:<8} {stats['clicks']:>5} clicks  p50 {stats['p50'] * 1e3:7.0f} ms  "
+              f"p95 {stats['p95'] * 1e3:7.0f} ms  p99 {stats['p99'] * 1e3:7.0f} ms")
+    print("  upstream " + ", ".join(f"{key}={value}" for key, value in sorted(report["upstream"].items())))
+    for error in report["errors"]:
+        print(f"  error: {error}", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Fail when a wizard step's reruns get slower or heavier than its budget.
+
+Walks app.py from Step 1 to the results and career details with OpenAI
+stubbed out, several times, and compares each step's p95 click latency and
+largest element count against tools/rerun_budgets.json::
+
+    python tools/rerun_budget.py --repeat 3
+
+Exits with status 1 when any budget is exceeded.
+"""
+import argparse
+import collections
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import wizard  # noqa: E402
+
+DEFAULT_BUDGETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rerun_budgets.json")
+
+def _p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+def measure(repeat, seed):
+    """Clicks grouped by step over `repeat` walks; the first page load is its own "load" step"""
+    by_step = collections.defaultdict(list)
+    for i in range(repeat):
+        session = wizard.WizardSession()
+        for click in session.walk(random.Random(seed + i)):
+            by_step["load" if click.action == "load" else click.step].append(click)
+    return by_step
+
+def check(by_step, budgets):
+    """Report lines and whether every step stayed within budget"""
+    lines = []
+    ok = True
+    for step, clicks in by_step.items():
+        p95 = _p95([click.seconds for click in clicks])
+        elements = max(click.elements for click in clicks)
+        budget = budgets.get(step, {})
+        over = []
+        if "max_seconds" in budget and p95 > budget["max_seconds"]:
+            over.append(f"p95 {p95:.3f}s > {budget['max_seconds']}s")
+        if "max_elements" in budget and elements > budget["max_elements"]:
+            over.append(f"{elements} elements > {budget['max_elements']}")
+        ok = ok and not over
+        lines.append(
+            f"{'FAIL' if over else 'ok':<4}  {step:<8} {len(clicks):>3} clicks  p95 {p95 * 1e3:7.1f} ms  "
+            f"max {max(click.seconds for click in clicks) * 1e3:7.1f} ms  {elements:>4} elements"
+            + (f"  ({'; '.join(over)})" if over else "")
+        )
+    return lines, ok
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check per-step rerun latency and element budgets.")
+    parser.add_argument("--budgets", default=DEFAULT_BUDGETS, help="budget JSON (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="wizard walks to measure (default: 3)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    with open(args.budgets, encoding="utf-8") as f:
+        budgets = json.load(f)
+    # Start from cold, throwaway caches with fake OpenAI clients
+    os.environ["LUCIDUS_CACHE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="lucidus-budget-"), "cache.sqlite3")
+    os.environ.pop("LUCIDUS_SNAPSHOT", None)
+    wizard.stub_openai()
+    wizard.reuse_compiled_script()
+
+    lines, ok = check(measure(args.repeat, args.seed), budgets)
+    print("\n".join(lines))
+    if not ok:
+        print("Rerun budget exceeded", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Drive app.py through the Step 1-4 wizard with streamlit's AppTest, timing every click.
+
+Shared by the rerun budget check and the load harness in this directory.
+"""
+import os
+import random
+import sys
+import threading
+import time
+import typing
+
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "app.py")
+
+# The app imports lucidus from the repository root, as under `streamlit run app.py`
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+class Click(typing.NamedTuple):
+    step: str
+    action: str
+    seconds: float
+    elements: int
+
+def count_elements(node):
+    """Rendered elements below `node`, not counting the blocks that contain them"""
+    total = 0
+    for child in getattr(node, "children", {}).values():
+        total += count_elements(child) if isinstance(child, Block) else 1
+    return total
+
+def stub_openai(latency=0.0):
+    """Make the app build offline fake clients instead of OpenAI ones"""
+    from lucidus import llm, llm_async
+    from lucidus.fakes import AsyncFakeOpenAI, FakeOpenAI
+    llm.create_client = lambda api_key, **kwargs: FakeOpenAI(latency)
+    llm_async.create_async_client = lambda api_key, **kwargs: AsyncFakeOpenAI(latency)
+
+def reuse_compiled_script():
+    """Compile app.py once per process, as a Streamlit server does, instead of on every AppTest run.
+
+    Compilation is also serialized: ``ast.parse`` is not thread-safe on Python 3.11.
+    """
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    compile_script = ScriptCache.get_bytecode
+    compiled = {}
+    lock = threading.Lock()
+
+    def get_bytecode(self, script_path):
+        with lock:
+            if script_path not in compiled:
+                compiled[script_path] = compile_script(self, script_path)
+            return compiled[script_path]
+
+    ScriptCache.get_bytecode = get_bytecode
+
+def allow_concurrent_sessions():
+    """Let WizardSessions run on several threads at once.
+
+    AppTest assumes one test at a time: every run installs a mock Runtime in
+    a global and clears it when done, which breaks any run still going on
+    another thread. Keep serving the last mock runtime instead, and stay in
+    AppTest mode for the life of the process.
+    """
+    from streamlit.runtime import Runtime
+    from streamlit.testing.v1.util import patch_config_options
+
+    last = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+        return last["runtime"]
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in last)
+    patch_config_options({"global.appTest": True}).__enter__()
+    reuse_compiled_script()
+
+class WizardSession:
+    """One simulated user; every interaction is recorded in `clicks`"""
+
+    def __init__(self, timeout=120):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+        self.at.secrets["openai"] = {"api_key": "sk-fake"}
+        self.clicks = []
+
+    def _record(self, step, action, run):
+        started = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - started
+        if self.at.exception:
+            raise RuntimeError(f"{step} / {action} raised: {self.at.exception[0].value}")
+        self.clicks.append(Click(step, action, seconds, count_elements(self.at._tree)))
+
+    def _button(self, match):
+        for button in self.at.button:
+            if match(button):
+                return button
+        raise LookupError("no matching button on the page")
+
+    def open(self):
+        self._record("step 1", "load", self.at.run)
+
+    def click_key(self, step, key):
+        self._record(step, key, self._button(lambda button: button.key == key).click().run)
+
+    def click_label(self, step, label):
+        self._record(step, label, self._button(lambda button: button.label.startswith(label)).click().run)
+
+    def keys(self, prefix):
+        return [button.key for button in self.at.button if button.key and button.key.startswith(prefix)]
+
+    def walk(self, rng=None, explore=2):
+        """Complete the wizard with random selections, then explore `explore` careers"""
+        rng = rng or random.Random()
+        self.open()
+        for key in rng.sample(self.keys("int_"), 3):
+            self.click_key("step 1", key)
+        self.click_label("step 1", "Next: Skills")
+        current = rng.sample(self.keys("current_"), 3)
+        desired = rng.sample(self.keys("desired_"), 3)
+        for key in current + desired:
+            self.click_key("step 2", key)
+        self.click_label("step 2", "Next: Values")
+        for key in rng.sample(self.keys("sdg_"), rng.randint(1, 3)):
+            self.click_key("step 3", key)
+        self.click_label("results", "See Results")
+        careers = self.keys("explore_")
+        for key in rng.sample(careers, min(explore, len(careers))):
+            self.click_key("explore", key)
+            self.click_label("explore", "← Back")
+        return self.clicks